@@ -0,0 +1,44 @@
+"""
+Bytes per live game, measured with tracemalloc.
+
+Run from the repository root:
+    python -m benchmarks.memory [count]
+"""
+
+import sys
+import tracemalloc
+
+from oop_game import BitBoard, CompactBoard, TTTGame
+from twenty_one import TwentyOneGame
+
+def bytes_per_instance(factory, count):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    instances = [factory() for _ in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    # Leave out the list that holds the instances.
+    allocated -= sys.getsizeof(instances)
+    return allocated / count
+
+def dealt_twenty_one_game():
+    game = TwentyOneGame()
+    game.dealer.shuffle_cards()
+    game.dealer.initial_deals(game.player)
+    return game
+
+def main(count=100000):
+    factories = (
+        ('TTTGame with Board', TTTGame),
+        ('TTTGame with CompactBoard', lambda: TTTGame(CompactBoard())),
+        ('TTTGame with BitBoard', lambda: TTTGame(BitBoard())),
+        ('TwentyOneGame (dealt)', dealt_twenty_one_game),
+    )
+    print(f"{count:,} live games each")
+    for label, factory in factories:
+        print(f"{label:<28}{bytes_per_instance(factory, count):>10,.0f} bytes/game")
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,54 @@
+"""
+MarkovComputer decisions per second, win rate and memory over a long run.
+
+The simulated human repeats a short pattern and plays a random move one
+round in five, so a model of their recent moves should beat them often.
+Memory is the size of the opponent's lists and arrays, measured after the
+first rounds and again at the end; it should not grow.
+
+Run from the repository root:
+    python -m benchmarks.rps_markov [rounds]
+"""
+
+import sys
+import time
+
+from game_random import GameRandom
+from practic2 import CLASSIC, MarkovComputer
+
+ROCK, PAPER, SCISSORS = range(3)
+PATTERN = (ROCK, ROCK, PAPER, SCISSORS, PAPER)
+
+def model_bytes(computer):
+    """Bytes held by the opponent's attributes and their list items."""
+    total = 0
+    for value in vars(computer).values():
+        total += sys.getsizeof(value)
+        if isinstance(value, list):
+            total += sum(sys.getsizeof(item) for item in value)
+    return total
+
+def main(rounds=10000000):
+    rng = GameRandom(0)
+    computer = MarkovComputer(rng)
+    wins = 0
+    early_bytes = None
+    start = time.perf_counter()
+    for round_number in range(rounds):
+        human_move = (rng.randrange(3) if rng.random() < 0.2
+                      else PATTERN[round_number % len(PATTERN)])
+        computer.choose()
+        wins += CLASSIC.payoff[human_move * 3 + computer.move] < 0
+        computer.observe(human_move)
+        if round_number == 1000:
+            early_bytes = model_bytes(computer)
+    elapsed = time.perf_counter() - start
+
+    print(f"{rounds:,} rounds in {elapsed:.1f}s: {rounds / elapsed:,.0f} decisions/s "
+          f"(choose + observe + simulated human)")
+    print(f"computer win rate: {wins / rounds:.3f} (random play: 0.333)")
+    print(f"model memory after 1,000 rounds: {early_bytes:,} bytes; "
+          f"after {rounds:,}: {model_bytes(computer):,} bytes")
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000000)
@@ -0,0 +1,286 @@
+"""
+Micro and macro benchmarks for every game's hot paths.
+
+Each benchmark reports the median time per operation in nanoseconds over
+N repeats. Every repeat is timed between two runs of a fixed calibration
+loop, and the median ratio of the two, `relative`, is what gets compared:
+when the whole machine slows down for a while, as shared and single-CPU
+hosts do by tens of percent, both sides slow down together.
+
+Results are written as JSON and compared against a stored baseline. A
+benchmark whose relative time exceeds its baseline by more than the
+tolerance is measured again, up to --confirm times, and the run fails only
+if every measurement agrees. The run also fails when a benchmark has no
+baseline entry or the baseline holds an entry for a benchmark that no
+longer exists. --save-baseline merges the results into the existing
+baseline, so saving a subset with --only keeps the other entries.
+
+Run from the repository root:
+    python -m benchmarks.suite                    # run and compare
+    python -m benchmarks.suite --save-baseline    # record a new baseline
+    python -m benchmarks.suite --only ttt         # names containing 'ttt'
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import timeit
+
+import ttt_simulate
+from game_random import GameRandom
+from oop_game import Human, Square, TTTGame
+from practic2 import RPSGame
+from cards import Hand as CodeHand
+from solution import busted, initialize_deck, total
+from twenty_one import Hand, Participants, TwentyOneTable
+from twenty_one_strategy import BasicStrategyPlayer
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                'baseline.json')
+DEFAULT_TOLERANCE = 0.4
+DEFAULT_REPEAT = 9
+DEFAULT_CONFIRM = 2
+
+BENCHMARKS = {}
+
+def benchmark(kind, number):
+    """Register `function(setup_result)` as a benchmark of `number` operations."""
+    def register(setup):
+        BENCHMARKS[setup.__name__] = (kind, number, setup)
+        return setup
+    return register
+
+def mid_game(moves=((5, 'X'), (1, 'O'), (9, 'X'), (3, 'O'))):
+    game = TTTGame()
+    for key, marker in moves:
+        game.board.mark_square_at(key, marker)
+    return game
+
+class RandomHuman(Human):
+    """Human that marks a random square instead of reading input."""
+    __slots__ = ('rng',)
+
+    def moves(self):
+        key = self.rng.choice(self.board.available_squares())
+        self.board.mark_square_at(key, self.marker)
+        return key
+
+# Micro-benchmarks: return a zero-argument callable doing one operation.
+
+@benchmark('micro', 200000)
+def ttt_winning_marker():
+    return mid_game().winning_marker
+
+@benchmark('micro', 200000)
+def computer_find_winning_square():
+    computer = mid_game().computer
+    return lambda: computer.find_winning_square(Square.HUMAN_MARKER)
+
+@benchmark('micro', 200000)
+def board_available_squares():
+    return mid_game().board.available_squares
+
+@benchmark('micro', 200000)
+def solution_total():
+    cards = ['AH', '10D', '5S', 'AC']
+    return lambda: total(cards)
+
+@benchmark('micro', 200000)
+def participants_calculate_additional_value():
+    participant = Participants()
+    participant.cards = Hand([('Spades', 7), ('Hearts', 'Ace')])
+    return participant.calculate_additional_value
+
+@benchmark('micro', 200000)
+def rps_round_result():
+    game = RPSGame()
+    game._human.move, game._computer.move = 0, 2
+    return game._round_result
+
+@benchmark('micro', 200000)
+def rps15_round_result():
+    game = RPSGame(moves=15)
+    game._human.move, game._computer.move = 3, 12
+    return game._round_result
+
+# Macro-benchmarks: one operation is a whole headless game or round.
+
+@benchmark('macro', 20000)
+def ttt_headless_game():
+    rng = random.Random(0)
+    return lambda: ttt_simulate.play_game(ttt_simulate.smart_agent,
+                                          ttt_simulate.random_agent, rng)
+
+@benchmark('macro', 2000)
+def ttt_object_game():
+    game = TTTGame(rng=GameRandom(0))
+    game.human = RandomHuman(game.board)
+    game.human.rng = random.Random(0)
+    sink = io.StringIO()
+
+    def play():
+        sink.seek(0)
+        sink.truncate()
+        with contextlib.redirect_stdout(sink):
+            game.play_one_game()
+    return play
+
+@benchmark('macro', 5000)
+def twenty_one_solution_hand():
+    random.seed(0)
+
+    def play():
+        deck = initialize_deck()
+        player_cards = CodeHand([deck.pop(), deck.pop()])
+        dealer_cards = CodeHand([deck.pop(), deck.pop()])
+        while total(player_cards) < 17:
+            player_cards.add(deck.pop())
+        if not busted(player_cards):
+            while total(dealer_cards) < 17:
+                dealer_cards.add(deck.pop())
+    return play
+
+@benchmark('macro', 2000)
+def twenty_one_full_table_round():
+    seats = [BasicStrategyPlayer(betting_money=10**9, goal=10**10)
+             for _ in range(TwentyOneTable.MAX_SEATS)]
+    table = TwentyOneTable(seats, decks=6, rng=GameRandom(0))
+    return table.play_round
+
+@benchmark('macro', 20000)
+def rps_round():
+    random.seed(0)
+    game = RPSGame(rng=GameRandom(0))
+
+    def play():
+        game._human.move = random.randrange(3)
+        game._computer.choose()
+        game._determine_winner()
+    return play
+
+def calibration():
+    """Fixed pure-Python work timed around every repeat of a benchmark."""
+    total = 0
+    for number in range(20000):
+        total += number * number % 7
+    return total
+
+def run(only=None, repeat=DEFAULT_REPEAT, names=None):
+    """
+    Return {name: {'kind': ..., 'ns_per_op': ..., 'relative': ...}} for the
+    benchmarks whose name contains `only` and, if given, is in `names`.
+    """
+    results = {}
+    for name, (kind, number, setup) in BENCHMARKS.items():
+        if (only and only not in name) or (names is not None and name not in names):
+            continue
+        operation = setup()
+        times = []
+        ratios = []
+        for _ in range(repeat):
+            before = timeit.timeit(calibration, number=1)
+            elapsed = timeit.timeit(operation, number=number) / number
+            after = timeit.timeit(calibration, number=1)
+            times.append(elapsed)
+            ratios.append(elapsed / ((before + after) / 2))
+        results[name] = {'kind': kind, 'ns_per_op': statistics.median(times) * 1e9,
+                         'relative': statistics.median(ratios)}
+    return results
+
+def compare(results, baseline, tolerance):
+    """
+    Return (regressions, missing, stale): (name, baseline ns, current ns,
+    relative change) for every benchmark slower than its baseline by more
+    than `tolerance`, the names of results without a baseline entry, and
+    the names of baseline entries that match no benchmark.
+    """
+    regressions = []
+    missing = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None or 'relative' not in previous:
+            missing.append(name)
+            continue
+        change = result['relative'] / previous['relative'] - 1
+        if change > tolerance:
+            regressions.append((name, previous['ns_per_op'], result['ns_per_op'], change))
+    stale = [name for name in baseline if name not in BENCHMARKS]
+    return regressions, missing, stale
+
+def confirm(regressions, baseline, tolerance, repeat, attempts):
+    """Measure suspected regressions again; keep those every attempt confirms."""
+    for _ in range(attempts):
+        if not regressions:
+            break
+        results = run(repeat=repeat, names={regression[0] for regression in regressions})
+        regressions = compare(results, baseline, tolerance)[0]
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the benchmark suite.')
+    parser.add_argument('--output', help='write results JSON to this file')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='allowed relative slowdown as a fraction (default %(default)s)')
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--only', help='run benchmarks whose name contains this')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--confirm', type=int, default=DEFAULT_CONFIRM,
+                        help='times to re-measure a suspected regression '
+                             '(default %(default)s)')
+    args = parser.parse_args()
+
+    results = run(args.only, args.repeat)
+    report = {'python': platform.python_version(),
+              'platform': platform.platform(),
+              'benchmarks': results}
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as file:
+            baseline = json.load(file)['benchmarks']
+
+    print(f"{'benchmark':<42}{'ns/op':>14}{'baseline':>14}{'change':>9}")
+    for name, result in results.items():
+        line = f"{name:<42}{result['ns_per_op']:>14,.0f}"
+        if 'relative' in baseline.get(name, {}):
+            previous = baseline[name]
+            line += (f"{previous['ns_per_op']:>14,.0f}"
+                     f"{result['relative'] / previous['relative'] - 1:>+9.0%}")
+        print(line)
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+
+    if args.save_baseline:
+        merged = dict(baseline, **results)
+        report['benchmarks'] = {name: merged[name] for name in BENCHMARKS if name in merged}
+        with open(args.baseline, 'w') as file:
+            json.dump(report, file, indent=2)
+            file.write('\n')
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    regressions, missing, stale = compare(results, baseline, args.tolerance)
+    regressions = confirm(regressions, baseline, args.tolerance, args.repeat, args.confirm)
+    for name, previous, current, change in regressions:
+        print(f"REGRESSION {name}: {previous:,.0f} -> {current:,.0f} ns/op "
+              f"({change:+.0%} relative to calibration)", file=sys.stderr)
+    for name in missing:
+        print(f"MISSING {name}: no baseline entry", file=sys.stderr)
+    for name in stale:
+        print(f"STALE {name}: baseline entry for a benchmark that no longer exists",
+              file=sys.stderr)
+    if missing or stale:
+        print("Run with --save-baseline to record a new baseline.", file=sys.stderr)
+    return 1 if regressions or missing or stale else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
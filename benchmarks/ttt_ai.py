@@ -0,0 +1,66 @@
+"""
+Moves per second of the tic-tac-toe Computer on each difficulty.
+
+Run from the repository root:
+    python -m benchmarks.ttt_ai
+"""
+
+import random
+import time
+
+from oop_game import (BitBoard, Board, Computer, HAS_ROW, Square,
+                      TRANSPOSITIONS, TTTGame)
+
+def random_positions(count, seed=0):
+    """
+    Return `count` lists of (key, marker) moves that leave a game in
+    progress with the computer to move.
+    """
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        board = BitBoard()
+        moves = []
+        marker = rng.choice((Square.HUMAN_MARKER, Square.COMPUTER_MARKER))
+        for _ in range(rng.randrange(0, 8)):
+            key = rng.choice(board.available_squares())
+            board.mark_square_at(key, marker)
+            moves.append((key, marker))
+            marker = (Square.COMPUTER_MARKER if marker == Square.HUMAN_MARKER
+                      else Square.HUMAN_MARKER)
+        if (marker == Square.COMPUTER_MARKER and not board.is_full()
+                and not HAS_ROW[board.bitmask(Square.HUMAN_MARKER)]
+                and not HAS_ROW[board.bitmask(Square.COMPUTER_MARKER)]):
+            positions.append(moves)
+    return positions
+
+def moves_per_second(board_class, difficulty, positions):
+    boards = []
+    for moves in positions:
+        board = board_class()
+        for key, marker in moves:
+            board.mark_square_at(key, marker)
+        boards.append(Computer(board, TTTGame.WINNING_ROWS, difficulty))
+
+    start = time.perf_counter()
+    for computer in boards:
+        computer.choose_square(Square.HUMAN_MARKER)
+    return len(boards) / (time.perf_counter() - start)
+
+def main():
+    positions = random_positions(20000)
+    TRANSPOSITIONS.clear()
+    print(f"{'board':<10}{'difficulty':<20}{'moves/s':>12}")
+    for board_class in (Board, BitBoard):
+        for difficulty, label in (('smart', 'smart'),
+                                  ('perfect', 'perfect (cold)'),
+                                  ('perfect', 'perfect (warm)'),
+                                  ('tablebase', 'tablebase')):
+            if label == 'perfect (cold)':
+                TRANSPOSITIONS.clear()
+            rate = moves_per_second(board_class, difficulty, positions)
+            print(f"{board_class.__name__:<10}{label:<20}{rate:>12,.0f}")
+    print(f"transposition table: {len(TRANSPOSITIONS)} positions")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+BatchBoards against per-board Python calls on the same positions.
+
+Run from the repository root:
+    python -m benchmarks.ttt_batch
+"""
+
+import random
+import time
+
+from oop_game import Board, Square, TTTGame
+from ttt_batch import COMPUTER, CODES, HUMAN, BatchBoards
+
+def random_boards(count, seed=0):
+    """Return `count` boards from random games stopped after 0 to 9 moves."""
+    rng = random.Random(seed)
+    boards = []
+    for _ in range(count):
+        board = Board()
+        game = TTTGame(board)
+        marker = Square.HUMAN_MARKER
+        for _ in range(rng.randrange(0, 10)):
+            if game.is_game_over():
+                break
+            board.mark_square_at(rng.choice(board.available_squares()), marker)
+            marker = (Square.COMPUTER_MARKER if marker == Square.HUMAN_MARKER
+                      else Square.HUMAN_MARKER)
+        boards.append(board)
+    return boards
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+def main(count=100000):
+    boards = random_boards(count)
+    batch = BatchBoards.from_boards(boards)
+    games = [TTTGame(board) for board in boards]
+    computers = [game.computer for game in games]
+
+    loop_winners, loop_time = timed(
+        lambda: [game.winning_marker() for game in games])
+    batch_winners, batch_time = timed(batch.winners)
+    assert [CODES[marker or Square.INITIAL_MARKER] for marker in loop_winners] \
+        == batch_winners.tolist()
+    print(f"winning_marker loop: {count / loop_time:>14,.0f} boards/s")
+    print(f"BatchBoards.winners: {count / batch_time:>14,.0f} boards/s")
+
+    loop_choices, loop_time = timed(
+        lambda: [computer.smart_choices(Square.HUMAN_MARKER) for computer in computers])
+    batch_choices, batch_time = timed(lambda: batch.smart_choices(COMPUTER, HUMAN))
+    assert [choice or 0 for choice in loop_choices] == batch_choices.tolist()
+    print(f"smart_choices loop:  {count / loop_time:>14,.0f} boards/s")
+    print(f"BatchBoards.smart:   {count / batch_time:>14,.0f} boards/s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+BatchHands against whole TwentyOneGame hands played one by one.
+
+Both sides play basic strategy against a one-deck shoe, so their results
+per hand should agree within sampling noise.
+
+Run from the repository root:
+    python -m benchmarks.twenty_one_batch
+"""
+
+import contextlib
+import os
+import time
+
+import numpy as np
+
+from twenty_one import TwentyOneGame
+from twenty_one_batch import PLAYER_WON, DEALER_WON, play_batch, strategy_array
+from twenty_one_strategy import BasicStrategyPlayer
+
+RESULTS = {'player': PLAYER_WON, 'dealer': DEALER_WON, 'tie': 0}
+
+def object_hands(count):
+    game = TwentyOneGame()
+    game.player = BasicStrategyPlayer()
+    results = []
+    with open(os.devnull, 'w') as null, contextlib.redirect_stdout(null):
+        for _ in range(count):
+            game.player.reset()
+            game.dealer.reset()
+            game.play_one_game()
+            results.append(RESULTS[game.determine_winner()])
+    return results
+
+def main(loop_count=20000, batch_count=1000000):
+    start = time.perf_counter()
+    loop_results = object_hands(loop_count)
+    loop_time = time.perf_counter() - start
+
+    hits = strategy_array()
+    start = time.perf_counter()
+    batch_results = play_batch(batch_count, hits, rng=np.random.default_rng(0)).results()
+    batch_time = time.perf_counter() - start
+
+    print(f"TwentyOneGame loop: {loop_count / loop_time:>12,.0f} hands/s"
+          f"  (mean result {sum(loop_results) / loop_count:+.4f})")
+    print(f"BatchHands:         {batch_count / batch_time:>12,.0f} hands/s"
+          f"  (mean result {batch_results.mean():+.4f})")
+
+if __name__ == '__main__':
+    main()
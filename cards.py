@@ -0,0 +1,186 @@
+"""
+Integer card encoding and a hand with running blackjack totals, shared by
+twenty_one.py and solution.py.
+
+A card is a code from 0 to 51: code // 4 is the rank index into RANKS
+(2 through 10, Jack, Queen, King, Ace) and code % 4 the suit index. Hand
+stores its codes in a bytearray and keeps a hard total (every Ace counted
+as 1) plus the number of Aces, so adding a card and reading the best total
+are both O(1).
+"""
+
+from game_random import GameRandom
+
+RANKS = ('2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A')
+SUIT_COUNT = 4
+DECK_SIZE = len(RANKS) * SUIT_COUNT
+ACE_RANK = RANKS.index('A')
+
+# Hard value of every card code, with Aces counted as 1.
+CARD_VALUES = tuple(1 if code // SUIT_COUNT == ACE_RANK
+                    else min(code // SUIT_COUNT + 2, 10)
+                    for code in range(DECK_SIZE))
+IS_ACE = tuple(code // SUIT_COUNT == ACE_RANK for code in range(DECK_SIZE))
+
+# Hi-Lo count tag per hard card value (index 0 unused): +1 for 2 to 6,
+# 0 for 7 to 9 and -1 for tens and Aces.
+HI_LO = (0, -1, 1, 1, 1, 1, 1, 0, 0, 0, -1)
+
+# Composition keys pack the count of each hard value 1 to 10 into 8 bits.
+COMPOSITION_BITS = 8
+
+def composition_key(counts):
+    """Pack counts indexed by hard value (index 0 unused) into one int."""
+    key = 0
+    for value in range(1, 11):
+        key |= counts[value] << (COMPOSITION_BITS * value)
+    return key
+
+def count_in_key(key, value):
+    """Return how many cards of hard `value` a composition key holds."""
+    return (key >> (COMPOSITION_BITS * value)) & 0xFF
+
+def card_code(rank, suit):
+    """Return the code of the card with rank index `rank` and suit index `suit`."""
+    return rank * SUIT_COUNT + suit
+
+def rank_of(code):
+    return code // SUIT_COUNT
+
+def suit_of(code):
+    return code % SUIT_COUNT
+
+def best_total(hard_total, aces):
+    """Count one Ace as 11 when that does not bust the hand."""
+    if aces and hard_total + 10 <= 21:
+        return hard_total + 10
+    return hard_total
+
+class Hand:
+    """Cards as codes in a bytearray with a running hard total and Ace count."""
+    __slots__ = ('_codes', 'hard_total', 'aces')
+
+    def __init__(self, codes=()):
+        self._codes = bytearray()
+        self.hard_total = 0
+        self.aces = 0
+        for code in codes:
+            self.add(code)
+
+    def add(self, code):
+        self._codes.append(code)
+        self.hard_total += CARD_VALUES[code]
+        self.aces += IS_ACE[code]
+
+    def clear(self):
+        self._codes.clear()
+        self.hard_total = 0
+        self.aces = 0
+
+    def __len__(self):
+        return len(self._codes)
+
+    def __getitem__(self, position):
+        return self._codes[position]
+
+    def __iter__(self):
+        return iter(self._codes)
+
+    def codes(self):
+        """Return the card codes as bytes."""
+        return bytes(self._codes)
+
+    @property
+    def total(self):
+        """Best blackjack total: one Ace counts 11 if that does not bust."""
+        return best_total(self.hard_total, self.aces)
+
+    @property
+    def is_soft(self):
+        """True when an Ace is currently counted as 11."""
+        return self.aces > 0 and self.hard_total + 10 <= 21
+
+    def busted(self):
+        return self.hard_total > 21
+
+class Shoe:
+    """
+    `decks` decks of card codes in one bytearray, dealt by advancing an
+    index. The shoe is reshuffled only once dealing passes the cut card,
+    placed after `penetration` of the cards, so a long session never runs
+    out of cards and never reshuffles every round.
+
+    Every dealt card also updates `composition`, the undealt cards of each
+    hard value (index 0 unused), and the Hi-Lo `running_count`.
+
+    Shuffle n puts the cards back in order and shuffles them with `stream`,
+    child stream n of `rng`, so a shoe is replayed from `stream.initial_seed`.
+    """
+    __slots__ = ('decks', 'penetration', 'rng', 'stream', 'shuffles', '_codes',
+                 '_position', '_cut', 'composition', 'running_count')
+
+    MAX_DECKS = 15
+
+    def __init__(self, decks=1, penetration=0.75, rng=None):
+        if not 1 <= decks <= Shoe.MAX_DECKS:
+            raise ValueError(f"A shoe holds 1 to {Shoe.MAX_DECKS} decks")
+        if not 0 < penetration <= 1:
+            raise ValueError("penetration must be in (0, 1]")
+        self.decks = decks
+        self.penetration = penetration
+        self.rng = GameRandom() if rng is None else rng
+        self.shuffles = 0
+        self._codes = bytearray(DECK_SIZE * decks)
+        self._cut = int(len(self._codes) * penetration)
+        self.shuffle()
+
+    def __len__(self):
+        """Return the number of cards left before the end of the shoe."""
+        return len(self._codes) - self._position
+
+    def shuffle(self, seed=None):
+        """Shuffle on the next child stream of rng, or on stream `seed`."""
+        if seed is None:
+            seed = self.rng.seed_for(self.shuffles)
+        self.shuffles += 1
+        self.stream = GameRandom(seed)
+        self._codes[:] = bytearray(range(DECK_SIZE)) * self.decks
+        self.stream.shuffle(self._codes)
+        self._position = 0
+        self.composition = [0] + [SUIT_COUNT * self.decks] * 9 + [4 * SUIT_COUNT * self.decks]
+        self.running_count = 0
+
+    @property
+    def dealt(self):
+        """Number of cards dealt since the last shuffle."""
+        return self._position
+
+    @property
+    def true_count(self):
+        """Running count per deck still undealt."""
+        return self.running_count * DECK_SIZE / max(len(self), 1)
+
+    def composition_key(self):
+        return composition_key(self.composition)
+
+    def needs_shuffle(self):
+        """True once the cut card has been reached."""
+        return self._position >= self._cut
+
+    def shuffle_if_needed(self):
+        """Reshuffle if the cut card has been reached; return True if it was."""
+        if self._position >= self._cut:
+            self.shuffle()
+            return True
+        return False
+
+    def deal(self):
+        """Return the next card code, reshuffling if the shoe is empty."""
+        if self._position >= len(self._codes):
+            self.shuffle()
+        code = self._codes[self._position]
+        self._position += 1
+        value = CARD_VALUES[code]
+        self.composition[value] -= 1
+        self.running_count += HI_LO[value]
+        return code
@@ -0,0 +1,210 @@
+"""
+Headless step environments for training and evaluating agents.
+
+Every environment has the same interface and never prints or reads input:
+
+    observation = env.reset()
+    observation, reward, done, info = env.step(action)
+    env.legal_actions()    # actions step accepts right now
+    env.observation()      # the agent's current view of the game
+
+TicTacToeEnv plays the human's side against one of ttt_simulate's agents
+on bitmasks, TwentyOneEnv plays the player's hand against Dealer and its
+shoe, and RPSEnv plays practic2 rounds to a target score. BatchEnv steps
+many environments per call and resets finished ones automatically.
+"""
+
+import cards
+from game_random import GameRandom
+from oop_game import EMPTY_KEYS, FULL_MASK, HAS_ROW
+from practic2 import OPPONENTS, variant
+from ttt_simulate import AGENTS
+from twenty_one import Dealer, Player, determine_winner
+
+class Env:
+    """Base class: reset, step, legal_actions and observation."""
+    def reset(self):
+        """Start a new episode and return its first observation."""
+        raise NotImplementedError
+
+    def step(self, action):
+        """Apply `action` and return (observation, reward, done, info)."""
+        raise NotImplementedError
+
+    def legal_actions(self):
+        raise NotImplementedError
+
+    def observation(self):
+        raise NotImplementedError
+
+    def _check(self, action):
+        if action not in self.legal_actions():
+            raise ValueError(f"Illegal action: {action!r}")
+
+class TicTacToeEnv(Env):
+    """
+    The agent marks squares 1 to 9 against `opponent`, a ttt_simulate
+    agent name. The observation holds 9 cells: 1 for the agent's marks,
+    -1 for the opponent's and 0 for empty squares. The reward is 1 for a
+    win, -1 for a loss and 0 otherwise.
+    """
+    def __init__(self, opponent='smart', agent_first=True, rng=None):
+        if opponent not in AGENTS:
+            raise ValueError(f"Unknown opponent: {opponent!r}")
+        self.opponent = AGENTS[opponent]
+        self.agent_first = agent_first
+        self.rng = GameRandom() if rng is None else rng
+        self.reset()
+
+    def reset(self):
+        self.own = self.other = 0
+        self.done = False
+        if not self.agent_first:
+            self.other = self.opponent(self.other, self.own, self.rng)
+        return self.observation()
+
+    def legal_actions(self):
+        if self.done:
+            return []
+        return list(EMPTY_KEYS[~(self.own | self.other) & FULL_MASK])
+
+    def observation(self):
+        return tuple(1 if self.own >> cell & 1 else -1 if self.other >> cell & 1 else 0
+                     for cell in range(9))
+
+    def step(self, action):
+        self._check(action)
+        self.own |= 1 << (action - 1)
+        if HAS_ROW[self.own]:
+            return self._finish(1, 'agent')
+        if self.own | self.other == FULL_MASK:
+            return self._finish(0, 'tie')
+        self.other |= self.opponent(self.other, self.own, self.rng)
+        if HAS_ROW[self.other]:
+            return self._finish(-1, 'opponent')
+        if self.own | self.other == FULL_MASK:
+            return self._finish(0, 'tie')
+        return self.observation(), 0, False, {}
+
+    def _finish(self, reward, winner):
+        self.done = True
+        return self.observation(), reward, True, {'winner': winner}
+
+class TwentyOneEnv(Env):
+    """
+    The agent plays one hand per episode with STAY (0) or HIT (1). The
+    observation is (player total, whether the total is soft, dealer upcard
+    value). The reward is Player.PAYOUTS of determine_winner: 1, -1 or 0.
+    The shoe persists across episodes, as in TwentyOneGame.
+    """
+    STAY = 0
+    HIT = 1
+
+    def __init__(self, decks=1, penetration=0.75, rng=None):
+        self.rng = GameRandom() if rng is None else rng
+        self.dealer = Dealer(decks, penetration, self.rng)
+        self.dealer.verbose = False
+        self.player = Player(verbose=False)
+        self.reset()
+
+    def reset(self):
+        self.dealer.shuffle_cards()
+        self.dealer.initial_deals(self.player)
+        self.dealer.reveal_card()
+        self.done = False
+        return self.observation()
+
+    def legal_actions(self):
+        return [] if self.done else [TwentyOneEnv.STAY, TwentyOneEnv.HIT]
+
+    def observation(self):
+        hand = self.player.cards
+        return (hand.total, hand.is_soft, cards.CARD_VALUES[self.dealer.upcard])
+
+    def step(self, action):
+        self._check(action)
+        if action == TwentyOneEnv.HIT:
+            self.dealer.deals_a_card(self.player)
+            if not self.player.busted():
+                return self.observation(), 0, False, {}
+        else:
+            self.dealer.plays(self.dealer)
+        self.done = True
+        result = determine_winner(self.player, self.dealer)
+        return self.observation(), Player.PAYOUTS[result], True, {'result': result}
+
+class RPSEnv(Env):
+    """
+    The agent picks moves 0 to N - 1 of practic2 variant(`moves`) against
+    an OPPONENTS computer until either side has `target` round wins, like
+    RPSGame. The observation is (agent score, computer score, the
+    computer's last move or -1). Each round's reward is its payoff.
+    """
+    def __init__(self, moves=3, opponent='random', target=5, rng=None):
+        if opponent not in OPPONENTS:
+            raise ValueError(f"Unknown opponent: {opponent!r}")
+        self.variant = variant(moves)
+        self.rng = GameRandom() if rng is None else rng
+        self.opponent_class = OPPONENTS[opponent]
+        self.target = target
+        self.reset()
+
+    def reset(self):
+        self.computer = self.opponent_class(self.rng, self.variant)
+        self.scores = [0, 0]
+        return self.observation()
+
+    def legal_actions(self):
+        return [] if self.target in self.scores else list(range(self.variant.size))
+
+    def observation(self):
+        last = -1 if self.computer.move is None else self.computer.move
+        return (self.scores[0], self.scores[1], last)
+
+    def step(self, action):
+        self._check(action)
+        self.computer.choose()
+        reward = self.variant.payoff[action * self.variant.size + self.computer.move]
+        if reward:
+            self.scores[reward < 0] += 1
+        self.computer.observe(action)
+        done = self.target in self.scores
+        info = {'winner': 'agent' if self.scores[0] == self.target else 'computer'} if done else {}
+        return self.observation(), reward, done, info
+
+class BatchEnv:
+    """
+    Many environments stepped together. step takes one action per
+    environment and returns lists of observations, rewards, dones and
+    infos; a finished environment is reset at once and its new first
+    observation is returned, with the final one kept in info['final'].
+    """
+    def __init__(self, make_env, count):
+        self.envs = [make_env() for _ in range(count)]
+
+    def __len__(self):
+        return len(self.envs)
+
+    def reset(self):
+        return [env.reset() for env in self.envs]
+
+    def legal_actions(self):
+        return [env.legal_actions() for env in self.envs]
+
+    def observation(self):
+        return [env.observation() for env in self.envs]
+
+    def step(self, actions):
+        if len(actions) != len(self.envs):
+            raise ValueError("step needs one action per environment")
+        observations, rewards, dones, infos = [], [], [], []
+        for env, action in zip(self.envs, actions):
+            observation, reward, done, info = env.step(action)
+            if done:
+                info['final'] = observation
+                observation = env.reset()
+            observations.append(observation)
+            rewards.append(reward)
+            dones.append(done)
+            infos.append(info)
+        return observations, rewards, dones, infos
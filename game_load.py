@@ -0,0 +1,111 @@
+"""
+Load generator for game_server.py.
+
+Opens many concurrent sessions that answer every prompt with a random valid
+move, then reports completed sessions per second and move latency, the time
+from sending an answer to receiving the next prompt. Sessions still playing
+after --max-moves answers are cut off and reported on their own, not counted
+as completed.
+
+Run `python game_load.py --sessions 2000 --concurrency 500 --game rps`
+against a running server.
+"""
+
+import argparse
+import asyncio
+import random
+import re
+import time
+
+from game_server import GAMES, GO_AHEAD
+from practic2 import variant
+
+RPS_MOVES = {'rps': variant(3).names, 'rpsls': variant(5).names}
+
+# run_session results besides failure.
+COMPLETED = 'completed'
+CUT_OFF = 'cut off'
+
+def answer(prompt, game, rng):
+    """Return the line to send for `prompt`, or None to end the session."""
+    if 'another game' in prompt:
+        return None
+    if game == 'ttt':
+        choices = re.search(r'\(([^)]*)\) to mark', prompt)
+        return rng.choice(re.findall(r'\d', choices.group(1)))
+    if game == '21':
+        return rng.choice(('hit', 'stay'))
+    return rng.choice(RPS_MOVES[game])
+
+async def run_session(host, port, game, rng, latencies, max_moves):
+    """
+    Play one session and return COMPLETED if it ended normally, CUT_OFF if
+    it was still playing after `max_moves` answers, or None if it failed.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        await reader.readuntil(GO_AHEAD)
+        writer.write(game.encode() + b'\n')
+        for _ in range(max_moves):
+            sent = time.perf_counter()
+            try:
+                text = (await reader.readuntil(GO_AHEAD)).decode(errors='replace')
+            except asyncio.IncompleteReadError:
+                return COMPLETED
+            latencies.append(time.perf_counter() - sent)
+            line = answer(text[text.rfind('\n') + 1:], game, rng)
+            if line is None:
+                return COMPLETED
+            writer.write(line.encode() + b'\n')
+        return CUT_OFF
+    except ConnectionError:
+        return None
+    finally:
+        writer.close()
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+async def generate_load(host, port, game, sessions, concurrency, max_moves, seed):
+    rng = random.Random(seed)
+    latencies = []
+    limit = asyncio.Semaphore(concurrency)
+
+    async def limited():
+        async with limit:
+            return await run_session(host, port, game, rng, latencies, max_moves)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(limited() for _ in range(sessions)),
+                                   return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    completed = sum(1 for result in results if result == COMPLETED)
+    cut_off = sum(1 for result in results if result == CUT_OFF)
+    return completed, cut_off, elapsed, latencies
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test game_server.py.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8021)
+    parser.add_argument('--game', choices=GAMES, default='rps')
+    parser.add_argument('--sessions', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=200)
+    parser.add_argument('--max-moves', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    completed, cut_off, elapsed, latencies = asyncio.run(generate_load(
+        args.host, args.port, args.game, args.sessions, args.concurrency,
+        args.max_moves, args.seed))
+
+    print(f'{completed}/{args.sessions} sessions completed in {elapsed:.2f}s '
+          f'({completed / elapsed:,.1f} sessions/s)')
+    if cut_off:
+        print(f'{cut_off} sessions cut off after --max-moves {args.max_moves} answers')
+    if latencies:
+        print(f'{len(latencies)} moves, latency p50 {percentile(latencies, 0.5) * 1000:.2f} ms, '
+              f'p99 {percentile(latencies, 0.99) * 1000:.2f} ms')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,179 @@
+"""
+Append-only binary log of finished games and a memory-mapped reader.
+
+Every game is one fixed-width RECORD_SIZE-byte record:
+
+    offset  size  field
+    0       1     game      TICTACTOE, TWENTY_ONE or RPS
+    1       1     outcome   TIE, HUMAN_WON or COMPUTER_WON (player/dealer
+                            for twenty-one)
+    2       1     first     FIRST_HUMAN or FIRST_COMPUTER for tic-tac-toe,
+                            SESSION_START on the first round of an RPS session
+    3       1     count     number of move bytes used
+    4       1     split     twenty-one: how many move bytes are player cards
+    5       1     option    tic-tac-toe: index of the Computer difficulty,
+                            twenty-one: decks in the shoe, RPS: index of the
+                            opponent in practic2.OPPONENTS
+    6       2     extra     twenty-one: cards dealt from the shoe before the
+                            hand, RPS: number of moves in the variant
+    8       8     seed      seed of the game's GameRandom stream (twenty-one:
+                            of the stream that shuffled the shoe)
+    16      24    moves     tic-tac-toe square keys in play order,
+                            twenty-one card codes from cards.py (player's cards
+                            then dealer's), or the human and computer move
+                            indexes (see practic2.Variant) of one RPS round
+
+Every round of an RPS session is a record of its own, all with the seed
+of the session's opponent, which plays every game of the session.
+game_replay re-runs any recorded game from these fields.
+
+GameLog maps the file and views it as a NumPy structured array, so
+statistics over hundreds of millions of records are computed chunk by
+chunk without creating a Python object per record. The reader requires
+numpy; the recorder does not.
+"""
+
+import mmap
+import struct
+
+TICTACTOE = 1
+TWENTY_ONE = 2
+RPS = 3
+
+TIE = 0
+HUMAN_WON = 1
+COMPUTER_WON = 2
+OUTCOMES = {'tie': TIE, None: TIE,
+            'human': HUMAN_WON, 'player': HUMAN_WON,
+            'computer': COMPUTER_WON, 'dealer': COMPUTER_WON}
+
+FIRST_HUMAN = 1
+FIRST_COMPUTER = 2
+SESSION_START = 1
+
+MAX_MOVES = 24
+RECORD = struct.Struct(f'<BBBBBBHQ{MAX_MOVES}s')
+RECORD_SIZE = RECORD.size
+
+class GameRecorder:
+    """Appends one record per finished game to a log file."""
+    def __init__(self, path):
+        self._file = open(path, 'ab')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._file.close()
+
+    def flush(self):
+        self._file.flush()
+
+    def record(self, game, outcome, moves, first=0, split=0, option=0, extra=0, seed=0):
+        moves = bytes(moves)
+        if len(moves) > MAX_MOVES:
+            raise ValueError(f"At most {MAX_MOVES} moves fit in a record")
+        self._file.write(RECORD.pack(game, outcome, first, len(moves), split,
+                                     option, extra, seed, moves))
+
+    def record_tictactoe(self, moves, winner, player_going_first, difficulty=0, seed=0):
+        """Record square keys `moves`; `winner` is 'human', 'computer', 'tie' or None."""
+        first = FIRST_HUMAN if player_going_first == 'human' else FIRST_COMPUTER
+        self.record(TICTACTOE, OUTCOMES[winner], moves, first, option=difficulty, seed=seed)
+
+    def record_twenty_one(self, player_codes, dealer_codes, winner, decks=1, dealt=0,
+                          seed=0):
+        """Record card codes; `winner` is 'player', 'dealer' or 'tie'."""
+        self.record(TWENTY_ONE, OUTCOMES[winner], bytes(player_codes) + bytes(dealer_codes),
+                    split=len(player_codes), option=decks, extra=dealt, seed=seed)
+
+    def record_rps(self, human_move, computer_move, winner, opponent=0, moves=3, seed=0,
+                   session_start=False):
+        """Record one round as move codes; `winner` is 'human', 'computer' or 'tie'."""
+        self.record(RPS, OUTCOMES[winner], (human_move, computer_move),
+                    SESSION_START if session_start else 0,
+                    option=opponent, extra=moves, seed=seed)
+
+def record_dtype():
+    import numpy as np
+    return np.dtype([('game', 'u1'), ('outcome', 'u1'), ('first', 'u1'),
+                     ('count', 'u1'), ('split', 'u1'), ('option', 'u1'),
+                     ('extra', '<u2'), ('seed', '<u8'), ('moves', 'u1', (MAX_MOVES,))])
+
+class GameLog:
+    """Read-only, memory-mapped view of a log written by GameRecorder."""
+    def __init__(self, path, chunk_records=1 << 22):
+        import numpy as np
+
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        usable = len(self._map) - len(self._map) % RECORD_SIZE
+        self.records = np.frombuffer(self._map, dtype=record_dtype(),
+                                     count=usable // RECORD_SIZE)
+        self.chunk_records = chunk_records
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return len(self.records)
+
+    def close(self):
+        del self.records
+        self._map.close()
+        self._file.close()
+
+    def chunks(self):
+        for start in range(0, len(self.records), self.chunk_records):
+            yield self.records[start:start + self.chunk_records]
+
+    def outcome_counts(self, game):
+        """Return {'tie': n, 'human': n, 'computer': n} for one game type."""
+        import numpy as np
+
+        counts = np.zeros(3, dtype=np.int64)
+        for chunk in self.chunks():
+            counts += np.bincount(chunk['outcome'][chunk['game'] == game], minlength=3)[:3]
+        return {'tie': int(counts[TIE]), 'human': int(counts[HUMAN_WON]),
+                'computer': int(counts[COMPUTER_WON])}
+
+    def _tictactoe_by_opening(self):
+        """Return a (10, 3) array: opening square x (tie, first won, second won)."""
+        import numpy as np
+
+        table = np.zeros((10, 3), dtype=np.int64)
+        for chunk in self.chunks():
+            games = chunk[(chunk['game'] == TICTACTOE) & (chunk['count'] > 0)]
+            result = np.where(games['outcome'] == TIE, 0,
+                              np.where(games['outcome'] == games['first'], 1, 2))
+            np.add.at(table, (games['moves'][:, 0], result), 1)
+        return table
+
+    def opening_win_rates(self):
+        """
+        Return {square: (games, first mover win rate, second mover win rate,
+        tie rate)} for every tic-tac-toe opening square that was played.
+        """
+        rates = {}
+        for square, (ties, first, second) in enumerate(self._tictactoe_by_opening().tolist()):
+            games = ties + first + second
+            if games:
+                rates[square] = (games, first / games, second / games, ties / games)
+        return rates
+
+    def first_mover_advantage(self):
+        """
+        Return (first mover win rate, second mover win rate, advantage) over
+        all tic-tac-toe games, where advantage is the difference of the two.
+        """
+        ties, first, second = self._tictactoe_by_opening().sum(axis=0).tolist()
+        games = ties + first + second
+        if not games:
+            return 0.0, 0.0, 0.0
+        return first / games, second / games, (first - second) / games
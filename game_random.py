@@ -0,0 +1,136 @@
+"""
+Splittable, seedable random streams shared by every game.
+
+GameRandom provides the parts of the random.Random API the games use over
+a wyrand generator: a 64-bit Weyl sequence whose every step is scrambled
+by one 64 x 64 -> 128-bit multiply folded back to 64 bits. That is half
+the arithmetic of a SplitMix64 step, which matters because every draw
+runs in Python. The whole state is one 64-bit integer, so a stream costs
+a few dozen bytes, seeding costs nothing, and a stream can be split into
+child streams by mixing its seed with a label through the SplitMix64
+finalizer. Children of different labels are independent of each other
+and of the parent, which lets simulations give every worker, shard or
+single game its own stream and replay any one of them later from its
+seed alone.
+
+    rng = GameRandom(7)
+    shard = rng.split(3)              # stream for shard 3
+    game_seed = shard.seed_for(1250)  # seed of that shard's game 1250
+    GameRandom(game_seed)             # replays exactly that game's draws
+"""
+
+import os
+
+MASK64 = (1 << 64) - 1
+# wyrand's Weyl increment and the constant its multiply mixes in.
+WY_GAMMA = 0xA0761D6478BD642F
+WY_MIX = 0xE7037ED1A0B428DB
+# Odd step between child seeds before mix64 scrambles them.
+SPLIT_GAMMA = 0xD1B54A32D192ED03
+
+def mix64(value):
+    """SplitMix64 finalizer: scramble a 64-bit integer."""
+    value = (value ^ (value >> 30)) * 0xBF58476D1CE4E5B9 & MASK64
+    value = (value ^ (value >> 27)) * 0x94D049BB133111EB & MASK64
+    return value ^ (value >> 31)
+
+class GameRandom:
+    """
+    random, randrange, choice and shuffle, as in random.Random, over a
+    wyrand stream. `initial_seed` is the 64-bit seed the stream started
+    from; a seed of None picks one from os.urandom.
+    """
+    __slots__ = ('initial_seed', '_state')
+
+    def __init__(self, seed=None):
+        self.seed(seed)
+
+    def seed(self, seed=None):
+        if seed is None:
+            seed = int.from_bytes(os.urandom(8), 'little')
+        if not isinstance(seed, int):
+            raise ValueError("GameRandom seeds are integers")
+        self.initial_seed = seed & MASK64
+        self._state = self.initial_seed
+
+    def getstate(self):
+        return self.initial_seed, self._state
+
+    def setstate(self, state):
+        self.initial_seed, self._state = state
+
+    def __reduce__(self):
+        return GameRandom, (self.initial_seed,), self.getstate()
+
+    def __setstate__(self, state):
+        self.setstate(state)
+
+    def _next(self):
+        self._state = state = (self._state + WY_GAMMA) & MASK64
+        product = state * (state ^ WY_MIX)
+        return ((product >> 64) ^ product) & MASK64
+
+    def getrandbits(self, k):
+        if k <= 64:
+            return self._next() >> (64 - k)
+        bits = 0
+        for shift in range(0, k, 64):
+            bits |= self._next() << shift
+        return bits & ((1 << k) - 1)
+
+    def random(self):
+        return (self._next() >> 11) * (1.0 / (1 << 53))
+
+    def _randbelow(self, n):
+        # Multiply-shift maps 64 random bits onto range(n); the bias is
+        # below n / 2**64.
+        return (self._next() * n) >> 64
+
+    def randrange(self, start, stop=None):
+        if stop is None:
+            start, stop = 0, start
+        if stop <= start:
+            raise ValueError("empty range for randrange()")
+        # _next and _randbelow inlined, as in choice.
+        self._state = state = (self._state + WY_GAMMA) & MASK64
+        product = state * (state ^ WY_MIX)
+        return start + ((((product >> 64) ^ product) & MASK64) * (stop - start) >> 64)
+
+    def choice(self, seq):
+        # _next inlined: choice is the hot call of every game's AI.
+        self._state = state = (self._state + WY_GAMMA) & MASK64
+        product = state * (state ^ WY_MIX)
+        return seq[(((product >> 64) ^ product) & MASK64) * len(seq) >> 64]
+
+    def shuffle(self, x):
+        """
+        Fisher-Yates shuffle in place. Each generator step supplies two
+        32-bit halves, one per swap; the bias is below len(x) / 2**32.
+        """
+        state = self._state
+        value = 0
+        for i in range(len(x) - 1, 0, -1):
+            if value:
+                half = value & 0xFFFFFFFF
+                value = 0
+            else:
+                state = (state + WY_GAMMA) & MASK64
+                value = state * (state ^ WY_MIX)
+                value = ((value >> 64) ^ value) & MASK64
+                half = value >> 32
+                value |= 1 << 64  # keeps the saved low half truthy even if 0
+            j = (half * (i + 1)) >> 32
+            x[i], x[j] = x[j], x[i]
+        self._state = state
+
+    def seed_for(self, label):
+        """Return the seed of child stream `label` (a non-negative int)."""
+        return mix64((self.initial_seed + (label + 1) * SPLIT_GAMMA) & MASK64)
+
+    def split(self, label):
+        """Return the child stream `label`; it does not advance this stream."""
+        return GameRandom(self.seed_for(label))
+
+    def spawn(self, count):
+        """Return child streams 0 to count - 1, e.g. one per worker process."""
+        return [self.split(label) for label in range(count)]
@@ -0,0 +1,157 @@
+"""
+Re-run games recorded by game_log.GameRecorder.
+
+Every record carries the seed of the GameRandom stream its game drew from
+(see game_log), so a game replays by feeding the recorded human moves back
+in while the computer, or the twenty-one shoe, draws from a stream built
+from that seed. The replay checks every computer move and card against
+the record and raises ValueError at the first difference, which means the
+game code changed since the log was written.
+
+Twenty-one hands are re-dealt for one seat, as TwentyOneGame plays them;
+a hand recorded at a TwentyOneTable with other seats does not replay.
+An RPS opponent plays every game of its session and learns from all of
+them, so an RPS round replays together with the earlier rounds of its
+session.
+
+    python game_replay.py games.bin 1250
+
+prints the moves of record 1250 (for RPS, of the whole session the round
+belongs to) as they are replayed.
+"""
+
+import argparse
+import collections
+
+import game_log
+from game_random import GameRandom
+from oop_game import WINNING_ROWS, Board, Computer, Square
+from practic2 import OPPONENTS, variant
+from twenty_one import Dealer, Deck, Player, determine_winner
+
+Record = collections.namedtuple(
+    'Record', 'game outcome first count split option extra seed moves')
+
+WINNERS = {Square.HUMAN_MARKER: 'human', Square.COMPUTER_MARKER: 'computer', None: 'tie'}
+
+def read_records(path):
+    """Return every record of the log at `path` as a list of Record tuples."""
+    with open(path, 'rb') as file:
+        data = file.read()
+    records = []
+    for offset in range(0, len(data) - len(data) % game_log.RECORD_SIZE,
+                        game_log.RECORD_SIZE):
+        fields = game_log.RECORD.unpack_from(data, offset)
+        records.append(Record(*fields[:-1], fields[-1][:fields[3]]))
+    return records
+
+def _check(expected, actual, what):
+    if expected != actual:
+        raise ValueError(f"Replay diverged at {what}: recorded {expected!r}, got {actual!r}")
+
+def replay_tictactoe(record):
+    """
+    Replay one tic-tac-toe record and return its moves as (player, square)
+    pairs, player being 'human' or 'computer'.
+    """
+    board = Board(WINNING_ROWS)
+    computer = Computer(board, WINNING_ROWS, Computer.DIFFICULTIES[record.option],
+                        GameRandom(record.seed))
+    player = 'human' if record.first == game_log.FIRST_HUMAN else 'computer'
+    moves = []
+    for number, square in enumerate(record.moves):
+        if player == 'human':
+            board.mark_square_at(square, Square.HUMAN_MARKER)
+        else:
+            _check(square, computer.moves(Square.HUMAN_MARKER), f"move {number + 1}")
+        moves.append((player, square))
+        player = 'computer' if player == 'human' else 'human'
+    winner = WINNERS[board.winning_marker()]
+    _check(record.outcome, game_log.OUTCOMES[winner], 'the outcome')
+    return moves
+
+def replay_twenty_one(record):
+    """
+    Re-deal one twenty-one record for a single seat and return the
+    finished (player, dealer) pair.
+    """
+    dealer = Dealer(record.option)
+    dealer.verbose = False
+    dealer.shoe.shuffle(record.seed)
+    for _ in range(record.extra):
+        dealer.shoe.deal()
+    player = Player(verbose=False)
+    dealer.initial_deals(player)
+    dealer.reveal_card()
+    for _ in range(record.split - 2):
+        dealer.deals_a_card(player)
+    _check(record.moves[:record.split], player.cards.codes(), "the player's cards")
+    if not player.busted():
+        dealer.plays(dealer)
+    _check(record.moves[record.split:], dealer.cards.codes(), "the dealer's cards")
+    _check(record.outcome, game_log.OUTCOMES[determine_winner(player, dealer)], 'the outcome')
+    return player, dealer
+
+def replay_rps(records):
+    """
+    Replay the rounds of one RPS session, in order, and return their
+    (human move, computer move) pairs.
+    """
+    first = records[0]
+    game_variant = variant(first.extra)
+    computer = list(OPPONENTS.values())[first.option](GameRandom(first.seed), game_variant)
+    rounds = []
+    for number, record in enumerate(records):
+        human_move, computer_move = record.moves
+        computer.choose()
+        _check(computer_move, computer.move, f"round {number + 1}")
+        result = game_variant.payoff[human_move * game_variant.size + computer_move]
+        winner = 'human' if result > 0 else 'computer' if result < 0 else 'tie'
+        _check(record.outcome, game_log.OUTCOMES[winner], f"round {number + 1}")
+        computer.observe(human_move)
+        rounds.append((human_move, computer_move))
+    return rounds
+
+def rps_session(records, index):
+    """Return the records of the RPS session that record `index` belongs to."""
+    seed = records[index].seed
+
+    def same_session(position):
+        return (0 <= position < len(records) and records[position].game == game_log.RPS
+                and records[position].seed == seed)
+
+    start = end = index
+    while records[start].first != game_log.SESSION_START and same_session(start - 1):
+        start -= 1
+    while same_session(end + 1) and records[end + 1].first != game_log.SESSION_START:
+        end += 1
+    return records[start:end + 1]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('log', help='file written by game_log.GameRecorder')
+    parser.add_argument('index', type=int, help='record number, from 0')
+    args = parser.parse_args()
+    records = read_records(args.log)
+    if not 0 <= args.index < len(records):
+        parser.error(f"the log holds {len(records)} records")
+    record = records[args.index]
+
+    if record.game == game_log.TICTACTOE:
+        for player, square in replay_tictactoe(record):
+            print(f"{player:<9}{square}")
+    elif record.game == game_log.TWENTY_ONE:
+        player, dealer = replay_twenty_one(record)
+        print(f"Player: {player.cards} ({player.total_values})")
+        print(f"Dealer: {dealer.cards} ({dealer.total_values}), showing "
+              f"{Deck.CARDS[dealer.upcard]}")
+    elif record.game == game_log.RPS:
+        game_variant = variant(record.extra)
+        for human_move, computer_move in replay_rps(rps_session(records, args.index)):
+            print(f"{game_variant.names[human_move]:<10}{game_variant.names[computer_move]}")
+    else:
+        parser.error(f"record {args.index} is not a game record")
+    print(f"Replayed from seed {record.seed}.")
+
+if __name__ == '__main__':
+    main()
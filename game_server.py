@@ -0,0 +1,116 @@
+"""
+asyncio TCP server that hosts many concurrent game sessions.
+
+Each connection gets its own TTTGame, TwentyOneGame or RPSGame and plays it
+through the game's *_async methods, so a session waiting for input never
+blocks the others. Anything a session's game prints goes back to that
+session's client: sys.stdout is replaced by SessionOutput, which writes to
+the session of the task that is running.
+
+Every prompt ends with the telnet Go Ahead sequence (GO_AHEAD) so clients
+know when the server is waiting for a line.
+
+Run `python game_server.py [--host HOST] [--port PORT]`, then connect with
+`telnet HOST PORT` or use game_load.py.
+"""
+
+import argparse
+import asyncio
+import contextvars
+import sys
+
+from oop_game import TTTGame, join_or
+from practic2 import RPSGame
+from twenty_one import TwentyOneGame
+
+GO_AHEAD = b'\xff\xf9'
+GAME_PROMPT = 'Which game would you like to play? (ttt, 21, rps, rpsls): '
+GAMES = {
+    'ttt': lambda ask: TTTGame().play_async(ask),
+    '21': lambda ask: TwentyOneGame().start_async(ask),
+    'rps': lambda ask: RPSGame().play_async(ask),
+    'rpsls': lambda ask: RPSGame(moves=5).play_async(ask),
+}
+
+current_session = contextvars.ContextVar('current_session', default=None)
+
+class SessionClosed(Exception):
+    """Raised when the client of a session disconnects."""
+
+class Session:
+    """One client connection and the stream its game reads from."""
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    def write(self, text):
+        self.writer.write(text.encode())
+
+    async def ask(self, prompt):
+        """Send `prompt` and return the client's next line without its newline."""
+        self.writer.write(prompt.encode() + GO_AHEAD)
+        await self.writer.drain()
+        line = await self.reader.readline()
+        if not line:
+            raise SessionClosed()
+        return line.decode(errors='replace').rstrip('\r\n')
+
+    async def close(self):
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+class SessionOutput:
+    """sys.stdout replacement that routes writes to the current session."""
+    def __init__(self, fallback):
+        self.fallback = fallback
+
+    def write(self, text):
+        session = current_session.get()
+        if session is None:
+            return self.fallback.write(text)
+        session.write(text)
+        return len(text)
+
+    def flush(self):
+        if current_session.get() is None:
+            self.fallback.flush()
+
+async def handle_session(reader, writer):
+    session = Session(reader, writer)
+    current_session.set(session)
+    try:
+        while True:
+            choice = (await session.ask(GAME_PROMPT)).strip().lower()
+            if choice in GAMES:
+                break
+            print(f'Please type {join_or(list(GAMES))}.')
+        await GAMES[choice](session.ask)
+        await writer.drain()
+    except (SessionClosed, ConnectionError):
+        pass
+    finally:
+        await session.close()
+
+async def serve(host, port):
+    sys.stdout = SessionOutput(sys.stdout)
+    server = await asyncio.start_server(handle_session, host, port, backlog=4096)
+    addresses = ', '.join(str(sock.getsockname()) for sock in server.sockets)
+    sys.stdout.fallback.write(f'Serving games on {addresses}\n')
+    async with server:
+        await server.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve the games over TCP.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8021)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
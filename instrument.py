@@ -0,0 +1,189 @@
+"""
+Optional per-phase timing instrumentation for the game loops.
+
+The games wrap their phases (render, ai_decision, win_check, input_wait,
+...) in `with INSTRUMENTS.phase(name):`. While instrumentation is disabled,
+phase() returns a shared do-nothing context manager, so the cost is one
+attribute check and an empty with-block. When enabled, every phase feeds a
+log2-bucketed histogram of nanoseconds and the games bump counters.
+
+Enable it with INSTRUMENTS.enable() or by setting GAME_INSTRUMENTS=1 in the
+environment. export() returns the histograms and counters, and
+start_profile()/stop_profile() and memory_snapshot() capture cProfile and
+tracemalloc data on demand. install_signal_handler() dumps all of it to a
+directory whenever the process receives SIGUSR1.
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import signal
+import time
+import tracemalloc
+
+class NullPhase:
+    """Context manager that does nothing; used while disabled."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+NULL_PHASE = NullPhase()
+
+class Histogram:
+    """Durations in nanoseconds, counted in power-of-two buckets."""
+    __slots__ = ('buckets', 'count', 'total', 'minimum', 'maximum')
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0
+        self.minimum = None
+        self.maximum = 0
+
+    def add(self, nanoseconds):
+        bucket = nanoseconds.bit_length()
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += nanoseconds
+        if self.minimum is None or nanoseconds < self.minimum:
+            self.minimum = nanoseconds
+        if nanoseconds > self.maximum:
+            self.maximum = nanoseconds
+
+    def percentile(self, fraction):
+        """Return the upper bound of the bucket holding the given fraction."""
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= fraction * self.count:
+                return 1 << bucket
+        return 0
+
+    def export(self):
+        return {
+            'count': self.count,
+            'total_ns': self.total,
+            'mean_ns': self.total / self.count if self.count else 0,
+            'min_ns': self.minimum or 0,
+            'max_ns': self.maximum,
+            'p50_ns': self.percentile(0.5),
+            'p99_ns': self.percentile(0.99),
+            # Bucket upper bounds in ns -> number of samples below them.
+            'buckets': {1 << bucket: count for bucket, count in sorted(self.buckets.items())},
+        }
+
+class Phase:
+    __slots__ = ('histogram', 'start')
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.add(time.perf_counter_ns() - self.start)
+        return False
+
+class Instruments:
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.histograms = {}
+        self.counters = {}
+        self._profiler = None
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        self.histograms = {}
+        self.counters = {}
+
+    def phase(self, name):
+        """Return a context manager that times one `name` phase."""
+        if not self.enabled:
+            return NULL_PHASE
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        return Phase(histogram)
+
+    def count(self, name, amount=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def export(self):
+        """Return the histograms and counters as a JSON-ready dict."""
+        return {'phases': {name: histogram.export()
+                           for name, histogram in self.histograms.items()},
+                'counters': dict(self.counters)}
+
+    def report(self):
+        """Return a short text table of every phase."""
+        lines = [f"{'phase':<16}{'count':>10}{'mean us':>12}{'p99 us':>12}{'total ms':>12}"]
+        for name, histogram in sorted(self.histograms.items()):
+            data = histogram.export()
+            lines.append(f"{name:<16}{data['count']:>10}{data['mean_ns'] / 1e3:>12.1f}"
+                         f"{data['p99_ns'] / 1e3:>12.1f}{data['total_ns'] / 1e6:>12.1f}")
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"{name:<16}{value:>10}")
+        return "\n".join(lines)
+
+    def start_profile(self):
+        """Start collecting a cProfile profile of the whole process."""
+        if self._profiler is None:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def stop_profile(self, path=None, limit=30):
+        """
+        Stop profiling. Dump the raw stats to `path` if given, and return
+        the `limit` most expensive functions by cumulative time as text.
+        """
+        if self._profiler is None:
+            return ''
+        self._profiler.disable()
+        profiler, self._profiler = self._profiler, None
+        if path is not None:
+            profiler.dump_stats(path)
+        text = io.StringIO()
+        pstats.Stats(profiler, stream=text).sort_stats('cumulative').print_stats(limit)
+        return text.getvalue()
+
+    def memory_snapshot(self, path=None, limit=20):
+        """
+        Take a tracemalloc snapshot (starting tracemalloc if needed). Dump it
+        to `path` if given, and return the `limit` largest allocation sites.
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        snapshot = tracemalloc.take_snapshot()
+        if path is not None:
+            snapshot.dump(path)
+        return "\n".join(str(stat) for stat in snapshot.statistics('lineno')[:limit])
+
+    def dump(self, directory):
+        """Write phases.json, profile.pstats (if profiling) and memory.snapshot."""
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, 'phases.json'), 'w') as file:
+            json.dump(self.export(), file, indent=2)
+        if self._profiler is not None:
+            self.stop_profile(os.path.join(directory, 'profile.pstats'))
+            self.start_profile()
+        self.memory_snapshot(os.path.join(directory, 'memory.snapshot'))
+
+    def install_signal_handler(self, directory, signum=getattr(signal, 'SIGUSR1', None)):
+        """Call dump(directory) whenever the process receives `signum`."""
+        signal.signal(signum, lambda *args: self.dump(directory))
+
+INSTRUMENTS = Instruments(enabled=os.environ.get('GAME_INSTRUMENTS') == '1')
@@ -1,17 +1,100 @@
 """
 Classes:
     Square: Represents a single cell on the board and its marker.
+    BaseBoard: Keys, rendering and the squares view shared by every board.
     Board:  Stores and renders the 3x3 grid of Square objects.
+    CompactBoard: Board variant that keeps its markers in a bytearray.
+    BitBoard: Board variant that keeps each marker as a 9-bit integer.
     Player/Human/Computer: Players with associated markers.
     TTTGame: Orchestrates gameplay, moves, and win/tie detection.
 """
 
 import random
-import os
+from collections.abc import Mapping
+from functools import lru_cache
+
+from game_random import GameRandom
+from instrument import INSTRUMENTS
+from renderer import Renderer
+
+WINNING_ROWS = (
+    (1, 2, 3),
+    (4, 5, 6),
+    (7, 8 ,9),
+    (1, 5, 9),
+    (3, 5, 7),
+    (1, 4, 7),
+    (2, 5, 8),
+    (3, 6, 9),
+)
+
+def square_bit(key):
+    """Return the bit that represents square `key` (1 to 9) on a BitBoard."""
+    return 1 << (key - 1)
+
+FULL_MASK = 0b111111111
+WINNING_MASKS = tuple(square_bit(a) | square_bit(b) | square_bit(c)
+                      for a, b, c in WINNING_ROWS)
+
+# (row mask, two marked squares, missing bit, missing key) in the same order
+# Computer.find_winning_square scans them: c, then a, then b for each row.
+THREATS = tuple(
+    (square_bit(a) | square_bit(b) | square_bit(c), pair, square_bit(missing), missing)
+    for a, b, c in WINNING_ROWS
+    for pair, missing in ((square_bit(a) | square_bit(b), c),
+                          (square_bit(b) | square_bit(c), a),
+                          (square_bit(a) | square_bit(c), b))
+)
+
+# COMPLETING_SQUARES[own] lists, in THREATS order, the (missing bit, missing
+# key) pairs that would complete a row for the 9-bit mask `own`.
+COMPLETING_SQUARES = tuple(tuple((missing_bit, missing_key)
+                                 for mask, pair, missing_bit, missing_key in THREATS
+                                 if own & mask == pair)
+                           for own in range(FULL_MASK + 1))
+
+# EMPTY_KEYS[mask] lists the keys whose bits are set in the 9-bit `mask`.
+EMPTY_KEYS = tuple(tuple(key for key in range(1, 10) if mask & square_bit(key))
+                   for mask in range(FULL_MASK + 1))
+
+# HAS_ROW[bits] is True when the 9-bit mask `bits` fills a winning row.
+HAS_ROW = tuple(any(bits & mask == mask for mask in WINNING_MASKS)
+                for bits in range(FULL_MASK + 1))
+
+# Solved positions, keyed by (mover bits, opponent bits). Shared by every
+# Computer in the process so repeated games never solve a position twice.
+TRANSPOSITIONS = {}
+
+def negamax(own, other):
+    """
+    Return the value of a position for the side to move with perfect play:
+    1 for a win, 0 for a tie and -1 for a loss.
 
-def clear_screen():
-    """Clear the terminal screen."""
-    os.system('clear')
+    `own` and `other` are the 9-bit masks of the mover and the opponent, and
+    neither may already fill a winning row. The search stops at the first
+    winning move (no sibling can do better) and memoizes exact values in
+    TRANSPOSITIONS.
+    """
+    key = (own, other)
+    value = TRANSPOSITIONS.get(key)
+    if value is not None:
+        return value
+
+    empty = ~(own | other) & FULL_MASK
+    value = 0 if not empty else -1
+    while empty:
+        bit = empty & -empty
+        empty ^= bit
+        mine = own | bit
+        if HAS_ROW[mine]:
+            value = 1
+            break
+        value = max(value, -negamax(other, mine))
+        if value == 1:
+            break
+
+    TRANSPOSITIONS[key] = value
+    return value
 
 def join_or(lst, delimiter=", ", conjunction="or"):
     """
@@ -37,8 +120,16 @@ def join_or(lst, delimiter=", ", conjunction="or"):
     if len(lst_str) <= 1:
         return "" if len(lst_str) == 0 else lst_str[0]
 
+@lru_cache(maxsize=None)
+def rows_through(winning_rows):
+    """Map each key to the indexes of the winning rows that contain it."""
+    return {key: tuple(line for line, row in enumerate(winning_rows) if key in row)
+            for key in range(1, 10)}
+
 class Square:
     """A single board cell that holds a marker."""
+    __slots__ = ('_marker',)
+
     INITIAL_MARKER = " "
     HUMAN_MARKER = "X"
     COMPUTER_MARKER = "O"
@@ -61,93 +152,412 @@ class Square:
         """Return True if the square has no marker."""
         return self.marker == Square.INITIAL_MARKER
 
-class Board:
-    """3x3 Tic Tac Toe grid addressed by keys 1 to 9."""
-    def __init__(self):
+class BaseBoard:
+    """
+    3x3 Tic Tac Toe grid addressed by keys 1 to 9. Subclasses store the
+    markers and provide marker_at, mark_square_at and the win, block and
+    full checks; `squares` is a view whose marker writes go through
+    mark_square_at.
+    """
+    __slots__ = ('winning_rows',)
+
+    def __init__(self, winning_rows=WINNING_ROWS):
+        self.winning_rows = winning_rows
         self.reset()
 
-    def reset(self):
-        self.squares = {key: Square() for key in range(1, 10)}
+    @property
+    def squares(self):
+        return SquaresView(self)
+
+    def lines(self):
+        """Return the rendered grid as a list of text lines."""
+        marker = [None] + [self.marker_at(key) for key in range(1, 10)]
+        return [
+            "",
+            "   |   |",
+            f" {marker[1]} | {marker[2]} | {marker[3]}",
+            "___|___|___",
+            "   |   |",
+            f" {marker[4]} | {marker[5]} | {marker[6]}",
+            "___|___|___",
+            "   |   |",
+            f" {marker[7]} | {marker[8]} | {marker[9]}",
+            "   |   |",
+            "",
+        ]
 
     def display(self):
-        print()
-        print("   |   |")
-        print(f" {self.squares[1]} | {self.squares[2]} | {self.squares[3]}")
-        print("___|___|___")
-        print("   |   |")
-        print(f" {self.squares[4]} | {self.squares[5]} | {self.squares[6]}")
-        print("___|___|___")
-        print("   |   |")
-        print(f" {self.squares[7]} | {self.squares[8]} | {self.squares[9]}")
-        print("   |   |")
-        print()
+        print("\n".join(self.lines()))
+
+    def bitmask(self, marker):
+        """Return the 9-bit mask of the squares holding `marker`."""
+        return sum(square_bit(key) for key in range(1, 10)
+                   if self.marker_at(key) == marker)
+
+class Board(BaseBoard):
+    """
+    Board of nine Square objects.
+
+    Besides the squares, the board keeps how many squares each marker holds
+    on every winning row and a bitmask of the empty keys, so win, block and
+    full checks never rescan the grid. Marker writes through `squares` go
+    through mark_square_at, so those counts always stay in step.
+    """
+    __slots__ = ('rows_through', '_squares',
+                 '_empty', '_line_counts', '_line_totals', '_winner')
+
+    def __init__(self, winning_rows=WINNING_ROWS):
+        self.rows_through = rows_through(winning_rows)
+        super().__init__(winning_rows)
+
+    def reset(self):
+        self._squares = {key: Square() for key in range(1, 10)}
+        self._reset_counts()
+
+    def _reset_counts(self):
+        self._empty = FULL_MASK
+        self._line_counts = {}
+        self._line_totals = bytearray(len(self.winning_rows))
+        self._winner = None
+
+    def available_squares(self):
+        """Return a list of keys for squares that are currently empty."""
+        return list(EMPTY_KEYS[self._empty])
+
+    def marker_at(self, key):
+        return self._squares[key].marker
+
+    def _place(self, key, marker):
+        self._squares[key].marker = marker
+
+    def mark_square_at(self, key, marker):
+        """Place a marker at a given board key"""
+        previous = self.marker_at(key)
+        if previous == marker:
+            return
+
+        if previous != Square.INITIAL_MARKER:
+            self._count_marker(key, previous, -1)
+        self._place(key, marker)
+        if marker == Square.INITIAL_MARKER:
+            self._empty |= square_bit(key)
+        else:
+            self._empty &= ~square_bit(key)
+            self._count_marker(key, marker, 1)
+
+    def _count_marker(self, key, marker, step):
+        counts = self._line_counts.get(marker)
+        if counts is None:
+            counts = self._line_counts[marker] = bytearray(len(self.winning_rows))
+        for line in self.rows_through[key]:
+            counts[line] += step
+            self._line_totals[line] += step
+            if counts[line] == 3 and self._winner is None:
+                self._winner = marker
+
+        if step < 0 and self._winner == marker:
+            self._winner = None
+            for other, other_counts in self._line_counts.items():
+                if 3 in other_counts:
+                    self._winner = other
+                    break
+
+    def is_full(self):
+        """Return True if there are no empty squares remaining."""
+        return not self._empty
+
+    def winning_marker(self):
+        """Return the marker that fills a winning row, or None."""
+        return self._winner
+
+    def find_winning_square(self, marker):
+        """Return the key that completes a row for `marker`, or None."""
+        counts = self._line_counts.get(marker)
+        if counts is None:
+            return None
+
+        for line, row in enumerate(self.winning_rows):
+            if counts[line] == 2 and self._line_totals[line] == 2:
+                for key in row:
+                    if self._empty & square_bit(key):
+                        return key
+
+        return None
+
+class SquareView:
+    """Square-like view of one key on a board that stores markers itself."""
+    __slots__ = ('_board', '_key')
+
+    def __init__(self, board, key):
+        self._board = board
+        self._key = key
+
+    def __str__(self):
+        return self.marker
+
+    @property
+    def marker(self):
+        return self._board.marker_at(self._key)
+
+    @marker.setter
+    def marker(self, marker):
+        self._board.mark_square_at(self._key, marker)
+
+    def is_empty(self):
+        """Return True if the square has no marker."""
+        return self.marker == Square.INITIAL_MARKER
+
+class SquaresView(Mapping):
+    """Read-only mapping of keys 1 to 9 to SquareView objects."""
+    __slots__ = ('_board',)
+
+    def __init__(self, board):
+        self._board = board
+
+    def __getitem__(self, key):
+        if key not in range(1, 10):
+            raise KeyError(key)
+        return SquareView(self._board, key)
+
+    def __iter__(self):
+        return iter(range(1, 10))
+
+    def __len__(self):
+        return 9
+
+class CompactBoard(Board):
+    """
+    Board that keeps its markers in a single 9-byte bytearray instead of
+    nine Square objects. `squares` is a view over the bytes, so it behaves
+    like Board everywhere else.
+    """
+    __slots__ = ('cells',)
+
+    def reset(self):
+        self.cells = bytearray(Square.INITIAL_MARKER * 9, 'ascii')
+        self._reset_counts()
+
+    def marker_at(self, key):
+        return chr(self.cells[key - 1])
+
+    def _place(self, key, marker):
+        self.cells[key - 1] = ord(marker)
+
+class BitBoard(BaseBoard):
+    """
+    3x3 Tic Tac Toe grid stored as one 9-bit integer per side.
+
+    Bit `key - 1` of `human_bits` or `computer_bits` is set when square
+    `key` holds that side's marker. Win, block and full-board checks are
+    table lookups and mask tests on the two integers, and `squares` is a
+    view over the bits so Human, Computer and TTTGame work with it the same
+    way they work with Board. The tables are built from WINNING_ROWS, so
+    no other rows are accepted.
+    """
+    __slots__ = ('human_bits', 'computer_bits')
+
+    def __init__(self, winning_rows=WINNING_ROWS):
+        if tuple(map(tuple, winning_rows)) != WINNING_ROWS:
+            raise ValueError("BitBoard only plays the standard WINNING_ROWS")
+        super().__init__(WINNING_ROWS)
+
+    def reset(self):
+        self.human_bits = 0
+        self.computer_bits = 0
+
+    def occupied(self):
+        """Return the bits of every marked square."""
+        return self.human_bits | self.computer_bits
+
+    def marker_at(self, key):
+        bit = square_bit(key)
+        if self.human_bits & bit:
+            return Square.HUMAN_MARKER
+        if self.computer_bits & bit:
+            return Square.COMPUTER_MARKER
+        return Square.INITIAL_MARKER
 
     def available_squares(self):
         """Return a list of keys for squares that are currently empty."""
-        return [key for key, square in self.squares.items()
-                            if square.is_empty()]
+        return list(EMPTY_KEYS[~(self.human_bits | self.computer_bits) & FULL_MASK])
 
     def mark_square_at(self, key, marker):
         """Place a marker at a given board key"""
-        self.squares[key].marker = marker
+        bit = square_bit(key)
+        if marker == Square.HUMAN_MARKER:
+            self.human_bits |= bit
+            self.computer_bits &= ~bit
+        elif marker == Square.COMPUTER_MARKER:
+            self.computer_bits |= bit
+            self.human_bits &= ~bit
+        elif marker == Square.INITIAL_MARKER:
+            self.human_bits &= ~bit
+            self.computer_bits &= ~bit
+        else:
+            raise ValueError(f"BitBoard has no bits for marker {marker!r}")
 
     def is_full(self):
         """Return True if there are no empty squares remaining."""
-        return len(self.available_squares()) == 0
+        return self.human_bits | self.computer_bits == FULL_MASK
+
+    def bitmask(self, marker):
+        """Return the 9-bit mask of the squares holding `marker`."""
+        if marker == Square.HUMAN_MARKER:
+            return self.human_bits
+        if marker == Square.COMPUTER_MARKER:
+            return self.computer_bits
+        return 0
+
+    def winning_marker(self):
+        """Return the marker that fills a winning row, or None."""
+        if HAS_ROW[self.human_bits]:
+            return Square.HUMAN_MARKER
+        if HAS_ROW[self.computer_bits]:
+            return Square.COMPUTER_MARKER
+        return None
+
+    def find_winning_square(self, marker):
+        """Return the key that completes a row for `marker`, or None."""
+        empty = ~(self.human_bits | self.computer_bits) & FULL_MASK
+        for missing_bit, missing_key in COMPLETING_SQUARES[self.bitmask(marker)]:
+            if empty & missing_bit:
+                return missing_key
+        return None
 
 class Player:
+    __slots__ = ('marker', 'board')
+
     def __init__(self, marker, board):
         self.marker = marker
         self.board = board
 
 class Human(Player):
+    __slots__ = ('score',)
+
     def __init__(self, board):
         super().__init__(Square.HUMAN_MARKER, board)
         self.score = 0
 
     def moves(self):
-        """Ask the user to choose a square to mark. If the choice is
-        not valid, error message will prompt.
+        """Ask the user to choose a square to mark and return its key. If
+        the choice is not valid, error message will prompt.
         """
 
         while True:
-            valid_choices = self.board.available_squares()
-            human_choice = input(f"Please enter a number ({join_or(valid_choices)}) to "
-                                    "mark a square. Square goes from left to right "
-                                    "from the top to the bottom: ")
-            try:
-                human_choice = int(human_choice)
-            except ValueError:
-                print("Invalid Input. Please type a number.")
-                continue
-
-            if not 1 <= human_choice <= 9:
-                print("Sorry, that's not a valid choice. Choose between 1 and 9")
-            elif human_choice not in valid_choices:
-                print("The square is already taken. Choose another square.")
-            else:
-                self.board.mark_square_at(human_choice, self.marker)
-                break
+            human_choice = input(self.move_prompt())
+            error = self.try_move(human_choice)
+            if error is None:
+                return int(human_choice)
+            print(error)
+
+    async def moves_async(self, ask):
+        """Same as moves, but reads each answer with the awaitable `ask`."""
+
+        while True:
+            human_choice = await ask(self.move_prompt())
+            error = self.try_move(human_choice)
+            if error is None:
+                return int(human_choice)
+            print(error)
+
+    def move_prompt(self):
+        valid_choices = self.board.available_squares()
+        return (f"Please enter a number ({join_or(valid_choices)}) to "
+                "mark a square. Square goes from left to right "
+                "from the top to the bottom: ")
+
+    def try_move(self, human_choice):
+        """Mark the square typed by the user and return None, or return
+        the error message when the choice is not valid.
+        """
+        try:
+            human_choice = int(human_choice)
+        except ValueError:
+            return "Invalid Input. Please type a number."
+
+        if not 1 <= human_choice <= 9:
+            return "Sorry, that's not a valid choice. Choose between 1 and 9"
+        if human_choice not in self.board.available_squares():
+            return "The square is already taken. Choose another square."
+
+        self.board.mark_square_at(human_choice, self.marker)
+        return None
 
 class Computer(Player):
-    def __init__(self, board, winning_rows):
+    __slots__ = ('score', 'winning_rows', 'difficulty', 'rng')
+
+    DIFFICULTIES = ('smart', 'perfect', 'tablebase')
+
+    # Memory-mapped ttt_tablebase.Tablebase shared by every Computer, opened
+    # on first use of the 'tablebase' difficulty.
+    tablebase = None
+
+    def __init__(self, board, winning_rows, difficulty='smart', rng=random):
         super().__init__(Square.COMPUTER_MARKER, board)
+        if difficulty not in Computer.DIFFICULTIES:
+            raise ValueError(f"Unknown difficulty: {difficulty!r}")
         self.score = 0
         self.winning_rows = winning_rows
+        self.difficulty = difficulty
+        self.rng = rng
 
     def moves(self, opponent_marker):
-        """When the human has 2 squares in a row with an unused square
-        in the 3rd position of that row, Computer will choose the unused square.
-        Otherwise, Computer choose a random empty square."""
+        """Mark the square picked by choose_square and return its key."""
+        with INSTRUMENTS.phase('ai_decision'):
+            computer_choice = self.choose_square(opponent_marker)
+        self.board.mark_square_at(computer_choice, self.marker)
+        return computer_choice
 
-        valid_choices = self.board.available_squares()
+    def choose_square(self, opponent_marker):
+        """
+        Return the key of the square the computer wants to mark.
 
-        if self.smart_choices(opponent_marker) is not None:
-            computer_choice = self.smart_choices(opponent_marker)
-        else:
-            computer_choice = random.choice(valid_choices)
+        On 'smart' difficulty, when either side has 2 squares in a row with
+        an unused square in the 3rd position of that row, Computer will choose
+        the unused square. Otherwise, Computer choose a random empty square.
+        On 'perfect' difficulty the choice comes from perfect_choice, and on
+        'tablebase' difficulty from tablebase_choice.
+        """
+        if self.difficulty == 'perfect':
+            return self.perfect_choice(opponent_marker)
+        if self.difficulty == 'tablebase':
+            return self.tablebase_choice(opponent_marker)
 
-        self.board.mark_square_at(computer_choice, self.marker)
+        computer_choice = self.smart_choices(opponent_marker)
+        if computer_choice is None:
+            computer_choice = self.rng.choice(self.board.available_squares())
+
+        return computer_choice
+
+    def perfect_choice(self, opponent_marker):
+        """
+        Return a square that is optimal under perfect play, picked at random
+        among equally good squares. An immediate win is always preferred.
+        """
+        own = self.board.bitmask(self.marker)
+        other = self.board.bitmask(opponent_marker)
+        best_value = None
+        best_choices = []
+
+        for key in self.board.available_squares():
+            mine = own | square_bit(key)
+            value = 2 if HAS_ROW[mine] else -negamax(other, mine)
+            if best_value is None or value > best_value:
+                best_value = value
+                best_choices = [key]
+            elif value == best_value:
+                best_choices.append(key)
+
+        return self.rng.choice(best_choices)
+
+    def tablebase_choice(self, opponent_marker):
+        """Return the precomputed best square from the shared tablebase."""
+        if Computer.tablebase is None:
+            import ttt_tablebase
+            Computer.tablebase = ttt_tablebase.open_tablebase()
+
+        return Computer.tablebase.best_move(self.board.bitmask(self.marker),
+                                            self.board.bitmask(opponent_marker))
 
     def smart_choices(self, opponent_marker):
         """
@@ -160,49 +570,38 @@ class Computer(Player):
         it returns None.
         """
 
-        if self.find_winning_square(self.marker) is not None:
-            return self.find_winning_square(self.marker)
+        winning_square = self.find_winning_square(self.marker)
+        if winning_square is not None:
+            return winning_square
 
-        if self.find_winning_square(opponent_marker) is not None:
-            return self.find_winning_square(opponent_marker)
-
-        return None
+        return self.find_winning_square(opponent_marker)
 
     def find_winning_square(self, marker):
+        """Return the key that completes a row for `marker`, or None."""
+        return self.board.find_winning_square(marker)
 
-        for a, b, c in self.winning_rows:
-            m_a = self.board.squares[a].marker
-            m_b = self.board.squares[b].marker
-            m_c = self.board.squares[c].marker
+class TTTGame:
+    """
+    Orchestrates Tic Tac Toe game. Game number n of a session draws from
+    the child stream rng.split(n), whose seed is kept in `game_seed` and
+    logged by the recorder, so game_replay can re-run any single game.
+    """
+    __slots__ = ('board', 'human', 'computer', 'player_going_first', 'renderer',
+                 'recorder', 'moves_played', 'rng', 'games_played', 'game_seed')
 
-            if m_a == m_b == marker and m_c == Square.INITIAL_MARKER:
-                return c
-            if m_b == m_c == marker and m_a == Square.INITIAL_MARKER:
-                return a
-            if m_a == m_c == marker and m_b == Square.INITIAL_MARKER:
-                return b
+    WINNING_ROWS = WINNING_ROWS
 
-        return None
-
-class TTTGame:
-    """Orchestrates Tic Tac Toe game."""
-
-    WINNING_ROWS = (
-        (1, 2, 3),
-        (4, 5, 6),
-        (7, 8 ,9),
-        (1, 5, 9),
-        (3, 5, 7),
-        (1, 4, 7),
-        (2, 5, 8),
-        (3, 6, 9),
-    )
-
-    def __init__(self):
-        self.board = Board()
+    def __init__(self, board=None, difficulty='smart', recorder=None, rng=None):
+        self.board = Board(TTTGame.WINNING_ROWS) if board is None else board
+        self.rng = GameRandom() if rng is None else rng
         self.human = Human(self.board)
-        self.computer = Computer(self.board, TTTGame.WINNING_ROWS)
+        self.computer = Computer(self.board, TTTGame.WINNING_ROWS, difficulty, self.rng)
         self.player_going_first = 'human'
+        self.renderer = Renderer()
+        self.recorder = recorder
+        self.moves_played = []
+        self.games_played = 0
+        self.game_seed = None
 
     def play(self):
         """Run the main game until someone wins or the borad is full."""
@@ -216,31 +615,88 @@ class TTTGame:
                 self.display_goodbye_message()
                 break
 
-    def play_one_game(self):
+    async def play_async(self, ask):
+        """Same as play, but reads the human's moves with the awaitable `ask`."""
+        self.display_welcome_message()
+
+        while True:
+            await self.play_one_game_async(ask)
+
+            if self.grand_winner_determined() is not None:
+                self.display_grand_winner()
+                self.display_goodbye_message()
+                break
+
+    def start_one_game(self):
+        """Clear the board and give the computer the next game's stream."""
         self.board.reset()
+        self.moves_played = []
+        self.game_seed = self.rng.seed_for(self.games_played)
+        self.games_played += 1
+        self.computer.rng = GameRandom(self.game_seed)
+
+    def play_one_game(self):
+        self.start_one_game()
         current_player = self.player_going_first
 
         while True:
 
-            clear_screen()
-            self.display_current_score()
-            self.board.display()
+            with INSTRUMENTS.phase('render'):
+                self.renderer.render([self.current_score()] + self.board.lines())
 
             if current_player == 'human':
 
-                self.human.moves()
+                with INSTRUMENTS.phase('input_wait'):
+                    self.moves_played.append(self.human.moves())
                 current_player = 'computer'
 
             elif current_player == 'computer':
 
-                self.computer.moves(self.human.marker)
+                self.moves_played.append(self.computer.moves(self.human.marker))
                 current_player = 'human'
 
-            if self.is_game_over():
+            INSTRUMENTS.count('ttt_moves')
+            with INSTRUMENTS.phase('win_check'):
+                game_over = self.is_game_over()
+            if game_over:
                 break
 
-        clear_screen()
-        self.board.display()
+        with INSTRUMENTS.phase('scoring'):
+            self.finish_one_game()
+        INSTRUMENTS.count('ttt_games')
+
+    async def play_one_game_async(self, ask):
+        self.start_one_game()
+        current_player = self.player_going_first
+
+        while True:
+
+            with INSTRUMENTS.phase('render'):
+                self.renderer.render([self.current_score()] + self.board.lines())
+
+            if current_player == 'human':
+
+                with INSTRUMENTS.phase('input_wait'):
+                    self.moves_played.append(await self.human.moves_async(ask))
+                current_player = 'computer'
+
+            elif current_player == 'computer':
+
+                self.moves_played.append(self.computer.moves(self.human.marker))
+                current_player = 'human'
+
+            INSTRUMENTS.count('ttt_moves')
+            with INSTRUMENTS.phase('win_check'):
+                game_over = self.is_game_over()
+            if game_over:
+                break
+
+        with INSTRUMENTS.phase('scoring'):
+            self.finish_one_game()
+        INSTRUMENTS.count('ttt_games')
+
+    def finish_one_game(self):
+        self.renderer.render(self.board.lines())
         self.display_results()
         self.update_current_score()
         self.update_player_going_first()
@@ -259,14 +715,7 @@ class TTTGame:
         if any winning row has three idential non-empty markers
         """
 
-        for a, b, c in TTTGame.WINNING_ROWS:
-            m_a = self.board.squares[a].marker
-            m_b = self.board.squares[b].marker
-            m_c = self.board.squares[c].marker
-            if m_a != Square.INITIAL_MARKER and (m_a == m_b == m_c):
-                return m_a
-
-        return None
+        return self.board.winning_marker()
 
     def determine_winner(self):
         winner_marker = self.winning_marker()
@@ -294,12 +743,17 @@ class TTTGame:
         elif winner == 'computer':
             self.computer.score += 1
 
+        if self.recorder is not None:
+            self.recorder.record_tictactoe(
+                self.moves_played, winner, self.player_going_first,
+                Computer.DIFFICULTIES.index(self.computer.difficulty), self.game_seed)
+
     def update_player_going_first(self):
         self.player_going_first = ('computer' if self.player_going_first == 'human'
         else 'human')
 
-    def display_current_score(self):
-        print(f'human: {self.human.score} = computer: {self.computer.score}')
+    def current_score(self):
+        return f'human: {self.human.score} = computer: {self.computer.score}'
 
     def display_grand_winner(self):
         if self.grand_winner_determined() == 'human':
@@ -314,11 +768,12 @@ class TTTGame:
         print("Thanks for playing Tic Tac Toe! Goodbye!")
 
     def display_results(self):
-        if self.determine_winner() == 'human':
+        winner = self.determine_winner()
+        if winner == 'human':
             print("You won! Congratulations!")
-        elif self.determine_winner() == 'computer':
+        elif winner == 'computer':
             print("Computer won!")
-        elif self.determine_winner() == 'tie':
+        elif winner == 'tie':
             print("It's a tie!")
 
     # @staticmethod
@@ -331,5 +786,6 @@ class TTTGame:
 
     #         print("Invalid input. Please enter y or n.")
 
-game = TTTGame()
-game.play()
+if __name__ == '__main__':
+    game = TTTGame()
+    game.play()
@@ -1,76 +1,220 @@
 import random
+from array import array
+
+from game_random import GameRandom
+from instrument import INSTRUMENTS
+from renderer import Renderer
+
+class Variant:
+    """
+    A cyclic game of N moves (N odd): move i beats move j when (i - j) % N
+    is odd, so every move beats half of the others. Moves are indexes into
+    `names`; payoff[human * size + computer] is 1 when the human wins, -1
+    when the computer wins and 0 for a tie.
+    """
+    def __init__(self, names):
+        if len(names) < 3 or len(names) % 2 == 0:
+            raise ValueError("A variant needs an odd number of moves, at least 3")
+        self.names = tuple(names)
+        self.size = len(names)
+        self.payoff = tuple(0 if human == computer
+                            else 1 if (human - computer) % self.size % 2 else -1
+                            for human in range(self.size)
+                            for computer in range(self.size))
+
+    def beating(self, move):
+        """Return a move that beats `move`."""
+        return (move + 1) % self.size
+
+CLASSIC = Variant(('rock', 'paper', 'scissors'))
+VARIANTS = {3: CLASSIC,
+            5: Variant(('rock', 'paper', 'scissors', 'spock', 'lizard'))}
+
+def variant(size):
+    """Return the variant with `size` moves, numbering unnamed moves from 1."""
+    if size not in VARIANTS:
+        VARIANTS[size] = Variant(tuple(f'move{number}' for number in range(1, size + 1)))
+    return VARIANTS[size]
 
 class Player:
-    CHOICES = ('rock', 'paper', 'scissors')
+    CHOICES = CLASSIC.names
 
-    def __init__(self):
+    def __init__(self, variant=CLASSIC):
+        self.variant = variant
         self.move = None
         self.score = 0
 
 class Computer(Player):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, rng=random, variant=CLASSIC):
+        super().__init__(variant)
+        self.rng = rng
+
+    def choose(self):
+        self.move = self.rng.randrange(self.variant.size)
+
+    def observe(self, human_move):
+        """Learn from the human's move once a round is over."""
+        pass
+
+class MarkovComputer(Computer):
+    """
+    Predicts the human's next move from order-1 to order-`max_order`
+    transition counts over the last `window` rounds and plays the move
+    that beats it.
+
+    For each order the counts live in a fixed array indexed by
+    (previous moves, next move), and a ring buffer remembers which count
+    every round added, so the round leaving the window is subtracted in
+    O(1) and memory never grows. Orders vote with a decaying score of
+    how often each has predicted right lately.
+    """
+    def __init__(self, rng=random, variant=CLASSIC, max_order=3, window=200, decay=0.9):
+        super().__init__(rng, variant)
+        if max_order < 1 or window < 1:
+            raise ValueError("max_order and window must be at least 1")
+        self.orders = range(1, max_order + 1)
+        self.window = window
+        self.decay = decay
+        choices = variant.size
+        self._counts = [array('l', [0]) * choices ** (order + 1) for order in self.orders]
+        self._added = [array('l', [-1]) * window for _ in self.orders]
+        self._contexts = [0] * max_order
+        self._scores = [0.0] * max_order
+        self._predictions = [None] * max_order
+        self._rounds = 0
+
+    def _predict(self, index):
+        """Return the likeliest next move for one order, or None."""
+        choices = self.variant.size
+        base = self._contexts[index] * choices
+        counts = self._counts[index][base:base + choices]
+        best = max(counts)
+        return counts.index(best) if best else None
 
     def choose(self):
-        self.move = random.choice(Player.CHOICES)
+        votes = [0.0] * self.variant.size
+        for index in range(len(self.orders)):
+            prediction = self._predictions[index] = self._predict(index)
+            if prediction is not None:
+                votes[prediction] += self._scores[index] + 1e-9
+        if not any(votes):
+            super().choose()
+            return
+        self.move = self.variant.beating(votes.index(max(votes)))
+
+    def observe(self, move):
+        choices = self.variant.size
+        slot = self._rounds % self.window
+        for index, order in enumerate(self.orders):
+            self._scores[index] = (self._scores[index] * self.decay
+                                   + (self._predictions[index] == move))
+            added = self._added[index]
+            counts = self._counts[index]
+            if added[slot] >= 0:
+                counts[added[slot]] -= 1
+            if self._rounds >= order:
+                count_index = self._contexts[index] * choices + move
+                counts[count_index] += 1
+                added[slot] = count_index
+            else:
+                added[slot] = -1
+            self._contexts[index] = (self._contexts[index] * choices + move) % choices ** order
+        self._rounds += 1
+
+OPPONENTS = {'random': Computer, 'markov': MarkovComputer}
 
 class Human(Player):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, variant=CLASSIC):
+        super().__init__(variant)
+        self.prompt = f'Please choose your move from {variant.names}: '
 
     def _human_choice(self):
         while True:
-            human_choice = (input(f'Please choose your move from {Player.CHOICES}: ')).lower()
-            if human_choice in Player.CHOICES:
-                return human_choice
-            else:
-                print("Invalid Input. Please choose one from 'rock', 'paper', or 'scissors'")
+            human_choice = (input(self.prompt)).lower()
+            if self._valid_choice(human_choice):
+                return self.variant.names.index(human_choice)
+
+    async def _human_choice_async(self, ask):
+        while True:
+            human_choice = (await ask(self.prompt)).lower()
+            if self._valid_choice(human_choice):
+                return self.variant.names.index(human_choice)
+
+    def _valid_choice(self, human_choice):
+        if human_choice in self.variant.names:
+            return True
+        print(f"Invalid Input. Please choose one of {', '.join(self.variant.names)}")
+        return False
 
     def choose(self):
         self.move = self._human_choice()
 
+    async def choose_async(self, ask):
+        self.move = await self._human_choice_async(ask)
+
 class RPSGame:
-    def __init__(self):
-        self._human = Human()
-        self._computer = Computer()
+    def __init__(self, recorder=None, rng=None, opponent='random', moves=3):
+        if opponent not in OPPONENTS:
+            raise ValueError(f"Unknown opponent: {opponent!r}")
+        self._variant = variant(moves)
+        self._rng = GameRandom() if rng is None else rng
+        self._human = Human(self._variant)
+        self._opponent = opponent
+        # One opponent for the whole session, so a learning opponent keeps
+        # what it learned from earlier games.
+        self._session_seed = self._rng.seed_for(0)
+        self._computer = OPPONENTS[opponent](GameRandom(self._session_seed), self._variant)
+        self._rounds_played = 0
+        self._renderer = Renderer()
+        self._recorder = recorder
 
     def _display_welcome_message(self):
-        print('Welcome to Rock Paper Scissors!')
+        if self._variant is CLASSIC:
+            print('Welcome to Rock Paper Scissors!')
+        else:
+            print(f"Welcome to Rock Paper Scissors with {self._variant.size} moves: "
+                  f"{', '.join(self._variant.names)}!")
 
     def _display_goodbye_message(self):
         print('Thanks for playing Rock Paper Scissors. Goodbye!')
 
-    def _human_wins(self):
-        human_move = self._human.move
-        computer_move = self._computer.move
-        return ((human_move == 'rock' and computer_move == 'scissors') or
-        (human_move == 'paper' and computer_move == 'rock') or
-        (human_move == 'scissors' and computer_move == 'paper'))
-    
-    def _computer_wins(self):
-        human_move = self._human.move
-        computer_move = self._computer.move
-        return ((computer_move == 'rock' and human_move == 'scissors') or
-        (computer_move == 'paper' and human_move == 'rock') or
-        (computer_move == 'scissors' and human_move == 'paper'))
+    def _round_result(self):
+        """1 if the human won the round, -1 if the computer did, 0 for a tie."""
+        return self._variant.payoff[self._human.move * self._variant.size
+                                    + self._computer.move]
 
     def _determine_winner(self):
-        if self._human_wins():
-            print('You win!')
+        result = self._round_result()
+        if result > 0:
             self._human.score += 1
-        elif self._computer_wins():
-            print('Computer wins!')
+            self._record('human')
+            return 'You win!'
+        elif result < 0:
             self._computer.score += 1
+            self._record('computer')
+            return 'Computer wins!'
         else:
-            print("It's a tie!")
+            self._record('tie')
+            return "It's a tie!"
+
+    def _record(self, winner):
+        if self._recorder is not None:
+            self._recorder.record_rps(self._human.move, self._computer.move, winner,
+                                      list(OPPONENTS).index(self._opponent),
+                                      self._variant.size, self._session_seed,
+                                      self._rounds_played == 0)
+        self._rounds_played += 1
 
-    def _display_current_score(self):
-        print(f'Current Score - You: {self._human.score} : Computer: {self._computer.score}')
+    def _current_score(self):
+        return f'Current Score - You: {self._human.score} : Computer: {self._computer.score}'
 
     def _display_winner(self):
-        print(f'You chose: {self._human.move}')
-        print(f'The computer chose: {self._computer.move}')
-        self._determine_winner()
+        result = self._determine_winner()
+        names = self._variant.names
+        self._renderer.show([f'You chose: {names[self._human.move]}',
+                             f'The computer chose: {names[self._computer.move]}',
+                             result,
+                             self._current_score()])
 
     def _grand_winner_determined(self):
         return self._human.score == 5 or self._computer.score == 5
@@ -83,8 +227,14 @@ class RPSGame:
             print('The grand winner is computer!')
     
 
+    _PLAY_AGAIN_PROMPT = 'Do you want to play another game? (Y/N): '
+
     def _play_again(self):
-        response = input('Do you want to play another game? (Y/N): ')
+        response = input(RPSGame._PLAY_AGAIN_PROMPT)
+        return response.strip().upper()
+
+    async def _play_again_async(self, ask):
+        response = await ask(RPSGame._PLAY_AGAIN_PROMPT)
         return response.strip().upper()
         
     def reset_score(self):
@@ -96,13 +246,37 @@ class RPSGame:
         while True:
             self.reset_score()
             while not self._grand_winner_determined():
-                self._human.choose()
-                self._computer.choose()
-                self._display_winner()
-                self._display_current_score()
+                with INSTRUMENTS.phase('input_wait'):
+                    self._human.choose()
+                with INSTRUMENTS.phase('ai_decision'):
+                    self._computer.choose()
+                with INSTRUMENTS.phase('win_check'):
+                    self._display_winner()
+                self._computer.observe(self._human.move)
+                INSTRUMENTS.count('rps_rounds')
             self._display_grand_winner()    
             if not self._play_again():
                 break
         self._display_goodbye_message()
 
-RPSGame().play()
+    async def play_async(self, ask):
+        """Same as play, but reads every answer with the awaitable `ask`."""
+        self._display_welcome_message()
+        while True:
+            self.reset_score()
+            while not self._grand_winner_determined():
+                with INSTRUMENTS.phase('input_wait'):
+                    await self._human.choose_async(ask)
+                with INSTRUMENTS.phase('ai_decision'):
+                    self._computer.choose()
+                with INSTRUMENTS.phase('win_check'):
+                    self._display_winner()
+                self._computer.observe(self._human.move)
+                INSTRUMENTS.count('rps_rounds')
+            self._display_grand_winner()
+            if not await self._play_again_async(ask):
+                break
+        self._display_goodbye_message()
+
+if __name__ == '__main__':
+    RPSGame().play()
@@ -0,0 +1,70 @@
+"""
+Buffered terminal renderer shared by the games.
+
+A Renderer composes each frame into one string and sends it with a single
+write, using ANSI escape sequences to move the cursor and rewriting only
+the lines that differ from the previous frame. Clearing the screen is an
+escape sequence too, so no shell process is started.
+"""
+
+import sys
+
+CSI = '\x1b['
+CLEAR_SCREEN = CSI + 'H' + CSI + '2J'
+CLEAR_LINE = CSI + 'K'
+CLEAR_BELOW = CSI + 'J'
+
+def move_to(row):
+    """Return the sequence that moves the cursor to column 1 of `row`."""
+    return f'{CSI}{row};1H'
+
+class Renderer:
+    """
+    Draws frames at the top of the terminal.
+
+    The stream defaults to whatever sys.stdout is at the time of each write,
+    so output can still be redirected after the renderer is created.
+    """
+    __slots__ = ('_stream', '_frame')
+
+    def __init__(self, stream=None):
+        self._stream = stream
+        self._frame = None
+
+    @property
+    def stream(self):
+        return sys.stdout if self._stream is None else self._stream
+
+    def _write(self, text):
+        self.stream.write(text)
+        self.stream.flush()
+
+    def clear(self):
+        """Clear the screen and forget the previous frame."""
+        self._write(CLEAR_SCREEN)
+        self._frame = []
+
+    def render(self, lines):
+        """
+        Draw `lines` from the top of the screen and leave the cursor on the
+        line below them, erasing anything printed there since the last frame.
+        """
+        lines = list(lines)
+        if self._frame is None:
+            buffer = [CLEAR_SCREEN]
+            previous = []
+        else:
+            buffer = []
+            previous = self._frame
+
+        for row, line in enumerate(lines, 1):
+            if row > len(previous) or previous[row - 1] != line:
+                buffer.append(move_to(row) + line + CLEAR_LINE)
+        buffer.append(move_to(len(lines) + 1) + CLEAR_BELOW)
+
+        self._write(''.join(buffer))
+        self._frame = lines
+
+    def show(self, lines):
+        """Print `lines` below the cursor in a single write."""
+        self._write(''.join(line + '\n' for line in lines))
@@ -0,0 +1,321 @@
+"""
+Round-robin tournament between Rock Paper Scissors strategies.
+
+Every pair of registered strategies plays `games` independent games of
+`rounds` rounds each. The games of a match run side by side: a strategy
+sees the moves of all its games as one NumPy array and answers with an
+array, and a round of every game is resolved with one lookup into the
+variant's payoff matrix. The batch strategies are NumPy models of their
+own ('markov' is an order-1 simplification of practic2.MarkovComputer);
+'game-random' and 'game-markov' enter the practic2.OPPONENTS classes the
+game itself plays, one opponent object per game, so their moves are
+chosen in Python while rounds are still resolved as arrays. Matches are
+spread across a multiprocessing pool, and each draws from its own
+generator seeded with GameRandom(seed).seed_for(match number).
+
+Ratings are Elo-scaled Bradley-Terry strengths fitted to the round results
+of all matches (a tie counts as half a win for each side).
+
+Run `python rps_tournament.py --games 1000 --rounds 1000` for a table, and
+add `--replay A B --game N` to re-run only the match of A and B from its
+seed and print the rounds of its game N.
+Requires numpy.
+"""
+
+import argparse
+import itertools
+import multiprocessing
+import os
+import time
+
+import numpy as np
+
+from game_random import GameRandom
+from practic2 import OPPONENTS, variant
+
+STRATEGIES = {}
+
+def strategy(name):
+    """Register a batch strategy class under `name`."""
+    def register(cls):
+        STRATEGIES[name] = cls
+        return cls
+    return register
+
+class BatchStrategy:
+    """
+    One strategy playing `games` games at once. choose returns a (games,)
+    array of moves; observe then receives both sides' moves of the round.
+    """
+    def __init__(self, games, variant, rng):
+        self.games = games
+        self.size = variant.size
+        self.rng = rng
+
+    def choose(self, round_number):
+        raise NotImplementedError
+
+    def observe(self, own, opponent):
+        pass
+
+    def beating(self, moves):
+        """Vectorized Variant.beating."""
+        return (moves + 1) % self.size
+
+@strategy('random')
+class RandomStrategy(BatchStrategy):
+    """Uniform random moves, like practic2.Computer."""
+    def choose(self, round_number):
+        return self.rng.integers(self.size, size=self.games)
+
+@strategy('rock')
+class ConstantStrategy(BatchStrategy):
+    """Always move 0."""
+    def choose(self, round_number):
+        return np.zeros(self.games, dtype=np.intp)
+
+@strategy('cyclic')
+class CyclicStrategy(BatchStrategy):
+    """Moves 0, 1, ..., N - 1 in turn, each game starting at random."""
+    def __init__(self, games, variant, rng):
+        super().__init__(games, variant, rng)
+        self.offsets = rng.integers(self.size, size=games)
+
+    def choose(self, round_number):
+        return (self.offsets + round_number) % self.size
+
+@strategy('copycat')
+class CopycatStrategy(BatchStrategy):
+    """Repeats the opponent's last move; random in the first round."""
+    def __init__(self, games, variant, rng):
+        super().__init__(games, variant, rng)
+        self.last = rng.integers(self.size, size=games)
+
+    def choose(self, round_number):
+        return self.last
+
+    def observe(self, own, opponent):
+        self.last = opponent
+
+@strategy('frequency')
+class FrequencyStrategy(BatchStrategy):
+    """Beats the opponent's most frequent move so far."""
+    def __init__(self, games, variant, rng):
+        super().__init__(games, variant, rng)
+        self.counts = np.zeros((games, self.size), dtype=np.int32)
+        self.rows = np.arange(games)
+
+    def choose(self, round_number):
+        if round_number == 0:
+            return self.rng.integers(self.size, size=self.games)
+        return self.beating(self.counts.argmax(axis=1))
+
+    def observe(self, own, opponent):
+        self.counts[self.rows, opponent] += 1
+
+@strategy('markov')
+class MarkovStrategy(BatchStrategy):
+    """
+    Order-1 version of practic2.MarkovComputer: beats the move the opponent
+    most often played after their previous move.
+    """
+    def __init__(self, games, variant, rng):
+        super().__init__(games, variant, rng)
+        self.counts = np.zeros((games, self.size, self.size), dtype=np.int32)
+        self.rows = np.arange(games)
+        self.previous = None
+
+    def choose(self, round_number):
+        if self.previous is None:
+            return self.rng.integers(self.size, size=self.games)
+        following = self.counts[self.rows, self.previous]
+        guesses = np.where(following.any(axis=1), following.argmax(axis=1),
+                           self.rng.integers(self.size, size=self.games))
+        return self.beating(guesses)
+
+    def observe(self, own, opponent):
+        if self.previous is not None:
+            self.counts[self.rows, self.previous, opponent] += 1
+        self.previous = opponent
+
+class OpponentStrategy(BatchStrategy):
+    """
+    Plays one practic2.OPPONENTS object per game, each drawing from its own
+    GameRandom seeded from the match's generator.
+    """
+    opponent = None
+
+    def __init__(self, games, variant, rng):
+        super().__init__(games, variant, rng)
+        self.players = [self.opponent(GameRandom(int(seed)), variant)
+                        for seed in rng.integers(1 << 63, size=games, dtype=np.uint64)]
+
+    def choose(self, round_number):
+        for player in self.players:
+            player.choose()
+        return np.fromiter((player.move for player in self.players), dtype=np.intp,
+                           count=self.games)
+
+    def observe(self, own, opponent):
+        for player, move in zip(self.players, opponent.tolist()):
+            player.observe(move)
+
+@strategy('game-random')
+class GameRandomStrategy(OpponentStrategy):
+    """practic2.Computer, as the game plays it."""
+    opponent = OPPONENTS['random']
+
+@strategy('game-markov')
+class GameMarkovStrategy(OpponentStrategy):
+    """practic2.MarkovComputer, as the game plays it."""
+    opponent = OPPONENTS['markov']
+
+def play_match(name_a, name_b, games, rounds, size, seed, trace=None):
+    """
+    Play `games` games of `rounds` rounds between two strategies and return
+    (a's round wins, b's round wins, ties). If `trace` is a list, the
+    (a's moves, b's moves) arrays of every round are appended to it.
+    """
+    rng = np.random.default_rng(seed)
+    game_variant = variant(size)
+    payoff = np.array(game_variant.payoff, dtype=np.int8)
+    player_a = STRATEGIES[name_a](games, game_variant, rng)
+    player_b = STRATEGIES[name_b](games, game_variant, rng)
+    wins = np.zeros(3, dtype=np.int64)
+    for round_number in range(rounds):
+        moves_a = player_a.choose(round_number)
+        moves_b = player_b.choose(round_number)
+        results = payoff[moves_a * size + moves_b]
+        if trace is not None:
+            trace.append((moves_a, moves_b))
+        wins += np.bincount(results + 1, minlength=3)
+        player_a.observe(moves_a, moves_b)
+        player_b.observe(moves_b, moves_a)
+    losses, ties, a_wins = wins.tolist()
+    return a_wins, losses, ties
+
+def match_seed(names, name_a, name_b, seed=0):
+    """Return the seed tournament(names, seed=seed) gives the match of a and b."""
+    run = GameRandom(seed)
+    for match, pair in enumerate(itertools.combinations(names, 2)):
+        if pair == (name_a, name_b):
+            return run.seed_for(match)
+    raise ValueError(f"{name_a} does not play {name_b} as the first side in {names}")
+
+def replay_match(names, name_a, name_b, games, rounds, size, seed=0, game=0):
+    """
+    Re-run the match of a and b from tournament(names, games, rounds, size,
+    seed) and return its result and the (a's move, b's move) pairs of game
+    number `game`.
+    """
+    if not 0 <= game < games:
+        raise ValueError(f"game must be in range({games})")
+    trace = []
+    result = play_match(name_a, name_b, games, rounds, size,
+                        match_seed(names, name_a, name_b, seed), trace)
+    return result, [(int(moves_a[game]), int(moves_b[game])) for moves_a, moves_b in trace]
+
+def _play_match(args):
+    return args[:2], play_match(*args)
+
+def bradley_terry(names, results, iterations=1000):
+    """
+    Fit Bradley-Terry strengths to {(a, b): (a wins, b wins, ties)} with the
+    minorization-maximization updates and return {name: Elo rating},
+    centred on 1500.
+    """
+    index = {name: position for position, name in enumerate(names)}
+    wins = np.zeros((len(names), len(names)))
+    for (name_a, name_b), (a_wins, b_wins, ties) in results.items():
+        wins[index[name_a], index[name_b]] += a_wins + ties / 2
+        wins[index[name_b], index[name_a]] += b_wins + ties / 2
+    games = wins + wins.T
+    strengths = np.ones(len(names))
+    for _ in range(iterations):
+        denominators = (games / (strengths[:, None] + strengths[None, :])).sum(axis=1)
+        updated = np.maximum(wins.sum(axis=1), 1e-9) / denominators
+        updated /= np.exp(np.log(updated).mean())
+        if np.allclose(updated, strengths, rtol=1e-10):
+            break
+        strengths = updated
+    elo = 400 * np.log10(strengths)
+    return {name: 1500 + rating for name, rating in zip(names, elo - elo.mean())}
+
+def tournament(names=None, games=1000, rounds=1000, size=3, seed=0, workers=None):
+    """
+    Play every pair of strategies and return {(a, b): (a wins, b wins, ties)}.
+    With workers=1 everything runs in this process.
+    """
+    names = list(names or STRATEGIES)
+    run = GameRandom(seed)
+    tasks = [(name_a, name_b, games, rounds, size, run.seed_for(match))
+             for match, (name_a, name_b) in enumerate(itertools.combinations(names, 2))]
+    if workers == 1:
+        return dict(map(_play_match, tasks))
+    with multiprocessing.Pool(workers or os.cpu_count() or 1) as pool:
+        return dict(pool.imap_unordered(_play_match, tasks))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('strategies', nargs='*',
+                        help=f"strategies to enter (default: all of {', '.join(STRATEGIES)})")
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--rounds', type=int, default=1000)
+    parser.add_argument('--moves', type=int, default=3, help='odd number of moves')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--replay', nargs=2, metavar=('A', 'B'),
+                        help='re-run only the match of A and B')
+    parser.add_argument('--game', type=int, default=0,
+                        help='game of the replayed match to print')
+    args = parser.parse_args()
+    names = args.strategies or list(STRATEGIES)
+    unknown = [name for name in names if name not in STRATEGIES]
+    if unknown or len(names) < 2:
+        parser.error(f"need two or more of {', '.join(STRATEGIES)}")
+    if args.replay:
+        replay(parser, names, args)
+        return
+
+    start = time.perf_counter()
+    results = tournament(names, args.games, args.rounds, args.moves, args.seed, args.workers)
+    elapsed = time.perf_counter() - start
+    ratings = bradley_terry(names, results)
+
+    win_rates = {}
+    for (name_a, name_b), (a_wins, b_wins, ties) in results.items():
+        played = a_wins + b_wins + ties
+        win_rates[name_a, name_b] = a_wins / played
+        win_rates[name_b, name_a] = b_wins / played
+
+    ranked = sorted(names, key=ratings.get, reverse=True)
+    print(f"{'strategy':<12}{'elo':>8}  " + ''.join(f"{name[:9]:>10}" for name in ranked))
+    for name in ranked:
+        cells = ''.join(f"{'':>10}" if other == name else f"{win_rates[name, other]:>10.3f}"
+                        for other in ranked)
+        print(f"{name:<12}{ratings[name]:>8.0f}  {cells}")
+    total_rounds = len(results) * args.games * args.rounds
+    print(f"{total_rounds:,} rounds in {elapsed:.2f}s ({total_rounds / elapsed:,.0f} rounds/s); "
+          f"cells are the row strategy's round win rate")
+
+def replay(parser, names, args):
+    """Print one game of the --replay match and the match's result."""
+    name_a, name_b = args.replay
+    if name_a not in names or name_b not in names:
+        parser.error(f"--replay needs two of {', '.join(names)}")
+    if names.index(name_a) > names.index(name_b):
+        name_a, name_b = name_b, name_a
+    try:
+        (a_wins, b_wins, ties), rounds = replay_match(
+            names, name_a, name_b, args.games, args.rounds, args.moves, args.seed, args.game)
+    except ValueError as error:
+        parser.error(str(error))
+    game_variant = variant(args.moves)
+    print(f"{name_a:<12}{name_b:<12}")
+    for move_a, move_b in rounds:
+        print(f"{game_variant.names[move_a]:<12}{game_variant.names[move_b]:<12}")
+    print(f"Match {name_a} - {name_b}: {a_wins} - {b_wins}, {ties} ties "
+          f"(seed {match_seed(names, name_a, name_b, args.seed)})")
+
+if __name__ == '__main__':
+    main()
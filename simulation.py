@@ -0,0 +1,56 @@
+"""
+Sharded, reproducible simulation runs shared by ttt_simulate and
+twenty_one_sim.
+
+A run of `count` numbered items (games or hands) is split into shards of
+consecutive numbers that run on a multiprocessing pool. Item n of a run
+draws from its own GameRandom stream, seeded with
+GameRandom(seed).seed_for(n), so results do not depend on the shard or
+worker count and any single item can be replayed on its own.
+"""
+
+import multiprocessing
+import os
+from collections import Counter
+
+from game_random import GameRandom
+
+def numbered_streams(start, count, seed):
+    """
+    Yield (n, rng) for items start to start + count - 1 of the run seeded
+    with `seed`. The same GameRandom is reseeded for every item.
+    """
+    run = GameRandom(seed)
+    rng = GameRandom(0)
+    for number in range(start, start + count):
+        rng.seed(run.seed_for(number))
+        yield number, rng
+
+def _play_shard(task):
+    play_shard, arguments = task
+    return play_shard(*arguments)
+
+def run_sharded(play_shard, arguments, count, seed=0, workers=None, shards=None):
+    """
+    Call play_shard(*arguments, start, size, seed) for every shard of a run
+    of `count` items across a process pool and return the merged Counter
+    of their results. `play_shard` must be a module-level function. With
+    workers=1 everything runs in this process.
+    """
+    workers = workers or os.cpu_count() or 1
+    shards = min(shards or workers * 4, count) or 1
+    sizes = [count // shards + (shard < count % shards) for shard in range(shards)]
+    starts = [sum(sizes[:shard]) for shard in range(shards)]
+    tasks = [(play_shard, (*arguments, start, size, seed))
+             for start, size in zip(starts, sizes)]
+
+    results = Counter()
+    if workers == 1:
+        for task in tasks:
+            results.update(_play_shard(task))
+        return results
+
+    with multiprocessing.Pool(workers) as pool:
+        for shard_results in pool.imap_unordered(_play_shard, tasks):
+            results.update(shard_results)
+    return results
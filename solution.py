@@ -1,38 +1,36 @@
 import random
 
+from cards import Hand
+from game_random import GameRandom
+
 SUITS = ('H', 'D', 'S', 'C')
 VALUES = ('2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A')
 
 def prompt(message):
     print(f"=> {message}")
 
-def initialize_deck():
-    deck = [f"{value}{suit}" for value in VALUES for suit in SUITS]
-    random.shuffle(deck)
-    return deck
-
-def total(cards):
-    sum_val = 0
-
-    for card in cards:
-        value = card[:-1]
+# Card names indexed by card code, e.g. CARD_NAMES[0] == '2H'.
+CARD_NAMES = tuple(f"{value}{suit}" for value in VALUES for suit in SUITS)
+CARD_CODES = {name: code for code, name in enumerate(CARD_NAMES)}
 
-        if value == "A":
-            sum_val += 11
-        elif value in ['J', 'Q', 'K']:
-            sum_val += 10
-        else:
-            sum_val += int(value)
+def initialize_deck(rng=random):
+    """Return a shuffled list of card codes (see cards.py)."""
+    deck = list(range(len(CARD_NAMES)))
+    rng.shuffle(deck)
+    return deck
 
-    # Correct for Aces
-    for card in cards:
-        value = card[:-1]
-        if sum_val <= 21:
-            break
-        if value == "A":
-            sum_val -= 10
+def card_name(code):
+    return CARD_NAMES[code]
 
-    return sum_val
+def total(cards):
+    """
+    Return the hand's blackjack total. A Hand answers in O(1); any other
+    iterable of card names or codes is turned into a Hand first.
+    """
+    if not isinstance(cards, Hand):
+        cards = Hand(CARD_CODES[card] if isinstance(card, str) else card
+                     for card in cards)
+    return cards.total
 
 def busted(cards):
     return total(cards) > 21
@@ -74,70 +72,76 @@ def play_again():
     return answer == 'y'
 
 def pop_two_from_deck(deck):
-    return [deck.pop(), deck.pop()]
+    return Hand([deck.pop(), deck.pop()])
 
 def hand(cards):
-    return ', '.join(cards)
-
-while True:
-    prompt('Welcome to Twenty-One!')
-
-     # initial deal
-    deck = initialize_deck()
-    player_cards = pop_two_from_deck(deck)
-    dealer_cards = pop_two_from_deck(deck)
+    return ', '.join(card_name(card) for card in cards)
 
-
-    prompt(f"Dealer has {dealer_cards[0]} and ?")
-    prompt(f"You have: {player_cards[0]} and {player_cards[1]}, for a total of {total(player_cards)}.")
-
-    # player turn
+def main(seed=None):
+    rng = GameRandom(seed)
     while True:
-        player_choice = input("Would you like to (h)it or (s)tay? ")
-        if player_choice not in ['h', 's']:
-            prompt("Sorry, must enter 'h' or 's'.")
-            continue
-
-        if player_choice == 'h':
-            player_cards.append(deck.pop())
-            prompt('You chose to hit!')
-            prompt(f"Your cards are now: {hand(player_cards)}")
-            prompt(f"Your total is now: {total(player_cards)}")
-
-        if player_choice == 's' or busted(player_cards):
-            break
+        prompt('Welcome to Twenty-One!')
+
+         # initial deal
+        deck = initialize_deck(rng)
+        player_cards = pop_two_from_deck(deck)
+        dealer_cards = pop_two_from_deck(deck)
+
+
+        prompt(f"Dealer has {card_name(dealer_cards[0])} and ?")
+        prompt(f"You have: {card_name(player_cards[0])} and {card_name(player_cards[1])}, "
+               f"for a total of {total(player_cards)}.")
+
+        # player turn
+        while True:
+            player_choice = input("Would you like to (h)it or (s)tay? ")
+            if player_choice not in ['h', 's']:
+                prompt("Sorry, must enter 'h' or 's'.")
+                continue
+
+            if player_choice == 'h':
+                player_cards.add(deck.pop())
+                prompt('You chose to hit!')
+                prompt(f"Your cards are now: {hand(player_cards)}")
+                prompt(f"Your total is now: {total(player_cards)}")
+
+            if player_choice == 's' or busted(player_cards):
+                break
+
+        if busted(player_cards):
+            display_results(dealer_cards, player_cards)
+            if play_again():
+                continue
+        else:
+            prompt(f"You stayed at {total(player_cards)}")
 
-    if busted(player_cards):
-        display_results(dealer_cards, player_cards)
-        if play_again():
-            continue
-    else:
-        prompt(f"You stayed at {total(player_cards)}")
+        # dealer turn
+        prompt("Dealer's turn...")
 
-    # dealer turn
-    prompt("Dealer's turn...")
+        while total(dealer_cards) < 17:
+            prompt("Dealer hits!")
+            dealer_cards.add(deck.pop())
+            prompt(f"Dealer's cards are now: {hand(dealer_cards)}")
 
-    while total(dealer_cards) < 17:
-        prompt("Dealer hits!")
-        dealer_cards.append(deck.pop())
-        prompt(f"Dealer's cards are now: {hand(dealer_cards)}")
+        if busted(dealer_cards):
+            prompt(f"Dealer total is now: {total(dealer_cards)}")
+            display_results(dealer_cards, player_cards)
+            if play_again():
+                continue
+        else:
+            prompt(f"Dealer stays at {total(dealer_cards)}")
 
-    if busted(dealer_cards):
-        prompt(f"Dealer total is now: {total(dealer_cards)}")
-        display_results(dealer_cards, player_cards)
-        if play_again():
-            continue
-    else:
-        prompt(f"Dealer stays at {total(dealer_cards)}")
+        # both player and dealer stays - compare cards!
 
-    # both player and dealer stays - compare cards!
+        print('==============')
+        prompt(f"Dealer has {hand(dealer_cards)}, for a total of: {total(dealer_cards)}")
+        prompt(f"Player has {hand(player_cards)}, for a total of: {total(player_cards)}")
+        print('==============')
 
-    print('==============')
-    prompt(f"Dealer has {hand(dealer_cards)}, for a total of: {total(dealer_cards)}")
-    prompt(f"Player has {hand(player_cards)}, for a total of: {total(player_cards)}")
-    print('==============')
+        display_results(dealer_cards, player_cards)
 
-    display_results(dealer_cards, player_cards)
+        if not play_again():
+            break
 
-    if not play_again():
-        break
\ No newline at end of file
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+"""BitBoard against Board: the same answers from two integers."""
+
+import pytest
+
+from game_random import GameRandom
+from oop_game import WINNING_ROWS, BitBoard, Board, Computer, Square
+
+def test_bitboard_matches_board():
+    rng = GameRandom(1)
+    for _ in range(500):
+        board, bits = Board(), BitBoard()
+        marker = Square.HUMAN_MARKER
+        while board.winning_marker() is None and not board.is_full():
+            key = rng.choice(board.available_squares())
+            board.mark_square_at(key, marker)
+            bits.mark_square_at(key, marker)
+            assert [bits.marker_at(key) for key in range(1, 10)] == \
+                   [board.marker_at(key) for key in range(1, 10)]
+            assert bits.available_squares() == board.available_squares()
+            assert bits.winning_marker() == board.winning_marker()
+            assert bits.is_full() == board.is_full()
+            for side in (Square.HUMAN_MARKER, Square.COMPUTER_MARKER):
+                assert bits.find_winning_square(side) == board.find_winning_square(side)
+            marker = (Square.COMPUTER_MARKER if marker == Square.HUMAN_MARKER
+                      else Square.HUMAN_MARKER)
+
+def test_computer_plays_on_a_bitboard():
+    board = BitBoard()
+    computer = Computer(board, WINNING_ROWS, 'perfect', GameRandom(2))
+    key = computer.moves(Square.HUMAN_MARKER)
+    assert board.squares[key].marker == Square.COMPUTER_MARKER
+    assert board.bitmask(Square.COMPUTER_MARKER) == 1 << (key - 1)
+
+def test_bitboard_rejects_other_rows_and_markers():
+    with pytest.raises(ValueError):
+        BitBoard(WINNING_ROWS[:6])
+    with pytest.raises(ValueError):
+        BitBoard().mark_square_at(1, '?')
+    assert BitBoard(list(map(list, WINNING_ROWS))).winning_rows == WINNING_ROWS
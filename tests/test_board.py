@@ -0,0 +1,65 @@
+"""The incremental counters of every board class against a full rescan."""
+
+from game_random import GameRandom
+from oop_game import WINNING_ROWS, BitBoard, Board, CompactBoard, Square
+
+MARKERS = (Square.HUMAN_MARKER, Square.COMPUTER_MARKER, Square.INITIAL_MARKER)
+
+def rescan(board):
+    """Return what the counters should say, computed from the markers alone."""
+    markers = {key: board.marker_at(key) for key in range(1, 10)}
+    winners = {markers[row[0]] for row in WINNING_ROWS
+               if markers[row[0]] != Square.INITIAL_MARKER
+               and markers[row[0]] == markers[row[1]] == markers[row[2]]}
+    threats = {}
+    for marker in MARKERS[:2]:
+        threats[marker] = None
+        for row in WINNING_ROWS:
+            row_markers = [markers[key] for key in row]
+            if (row_markers.count(marker) == 2
+                    and row_markers.count(Square.INITIAL_MARKER) == 1):
+                threats[marker] = row[row_markers.index(Square.INITIAL_MARKER)]
+                break
+    empty = [key for key in range(1, 10) if markers[key] == Square.INITIAL_MARKER]
+    return markers, winners, threats, empty
+
+def check(board):
+    markers, winners, threats, empty = rescan(board)
+    assert board.available_squares() == empty
+    assert board.is_full() == (not empty)
+    if winners:
+        assert board.winning_marker() in winners
+    else:
+        assert board.winning_marker() is None
+    for marker in MARKERS[:2]:
+        assert board.find_winning_square(marker) == threats[marker]
+        assert board.bitmask(marker) == sum(1 << (key - 1) for key in range(1, 10)
+                                            if markers[key] == marker)
+    assert [board.squares[key].marker for key in range(1, 10)] == list(markers.values())
+
+def test_counters_follow_random_edits():
+    rng = GameRandom(6)
+    for board_class in (Board, CompactBoard, BitBoard):
+        board = board_class()
+        for step in range(5000):
+            if step % 40 == 0:
+                board.reset()
+            key = rng.randrange(1, 10)
+            marker = rng.choice(MARKERS)
+            if step % 2:
+                board.mark_square_at(key, marker)
+            else:
+                board.squares[key].marker = marker
+            check(board)
+
+def test_games_played_to_the_end():
+    rng = GameRandom(9)
+    for board_class in (Board, CompactBoard, BitBoard):
+        for _ in range(300):
+            board = board_class()
+            marker = Square.HUMAN_MARKER
+            while board.winning_marker() is None and not board.is_full():
+                board.mark_square_at(rng.choice(board.available_squares()), marker)
+                marker = (Square.COMPUTER_MARKER if marker == Square.HUMAN_MARKER
+                          else Square.HUMAN_MARKER)
+                check(board)
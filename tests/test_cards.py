@@ -0,0 +1,79 @@
+"""Hand totals and Shoe bookkeeping in cards.py."""
+
+import itertools
+
+import solution
+from cards import (DECK_SIZE, HI_LO, RANKS, SUIT_COUNT, CARD_VALUES, Hand, Shoe,
+                   card_code, composition_key, count_in_key)
+from game_random import GameRandom
+
+def old_total(cards):
+    """solution.total as it was before Hand: card names, Aces demoted one at a time."""
+    sum_val = 0
+    for card in cards:
+        value = card[:-1]
+        if value == "A":
+            sum_val += 11
+        elif value in ['J', 'Q', 'K']:
+            sum_val += 10
+        else:
+            sum_val += int(value)
+    for card in cards:
+        value = card[:-1]
+        if sum_val <= 21:
+            break
+        if value == "A":
+            sum_val -= 10
+    return sum_val
+
+def test_hand_total_matches_old_total():
+    for size in range(1, 5):
+        for ranks in itertools.product(range(len(RANKS)), repeat=size):
+            codes = [card_code(rank, position % SUIT_COUNT)
+                     for position, rank in enumerate(ranks)]
+            names = [solution.card_name(code) for code in codes]
+            hand = Hand(codes)
+            assert hand.total == old_total(names) == solution.total(names), names
+            assert hand.busted() == (hand.total > 21)
+            assert hand.is_soft == (hand.total == hand.hard_total + 10)
+
+def test_hand_total_of_long_hands():
+    rng = GameRandom(14)
+    for _ in range(2000):
+        codes = [rng.randrange(DECK_SIZE) for _ in range(rng.randrange(5, 12))]
+        hand = Hand()
+        for code in codes:
+            hand.add(code)
+        assert hand.total == old_total([solution.card_name(code) for code in codes])
+        assert list(hand) == codes
+
+def undealt_values(shoe):
+    counts = [0] * 11
+    for code in shoe._codes[shoe._position:]:
+        counts[CARD_VALUES[code]] += 1
+    return counts
+
+def test_shoe_composition_and_running_count():
+    for decks in (1, 2, 6):
+        shoe = Shoe(decks, 0.75, GameRandom(decks))
+        running_count = 0
+        for _ in range(3 * DECK_SIZE * decks):
+            if shoe.shuffle_if_needed():
+                running_count = 0
+            code = shoe.deal()
+            running_count += HI_LO[CARD_VALUES[code]]
+            assert shoe.running_count == running_count
+            assert shoe.composition == undealt_values(shoe)
+            key = shoe.composition_key()
+            assert [count_in_key(key, value) for value in range(1, 11)] == shoe.composition[1:]
+            assert key == composition_key(shoe.composition)
+            assert shoe.true_count == running_count * DECK_SIZE / max(len(shoe), 1)
+
+def test_shoe_reshuffles_when_empty():
+    shoe = Shoe(1, 1, GameRandom(0))
+    dealt = sorted(shoe.deal() for _ in range(DECK_SIZE))
+    assert dealt == list(range(DECK_SIZE))
+    assert shoe.running_count == 0
+    shoe.deal()
+    assert len(shoe) == DECK_SIZE - 1
+    assert sum(shoe.composition) == DECK_SIZE - 1
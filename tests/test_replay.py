@@ -0,0 +1,96 @@
+"""Games recorded by the interactive games replay from their logged seeds."""
+
+import asyncio
+import random
+
+import pytest
+
+import game_log
+import game_replay
+from game_random import GameRandom
+from oop_game import TTTGame
+from practic2 import RPSGame
+from twenty_one import TwentyOneGame
+
+def scripted(answer):
+    """Return an awaitable ask() that answers every prompt with answer(prompt)."""
+    async def ask(prompt):
+        return answer(prompt)
+    return ask
+
+def test_tictactoe_games_replay(tmp_path):
+    path = tmp_path / 'games.bin'
+    script = random.Random(1)
+    for difficulty in ('smart', 'perfect'):
+        with game_log.GameRecorder(path) as recorder:
+            game = TTTGame(difficulty=difficulty, recorder=recorder, rng=GameRandom(4))
+            ask = scripted(lambda prompt: str(script.choice(game.board.available_squares())))
+            for _ in range(20):
+                asyncio.run(game.play_one_game_async(ask))
+                game.update_player_going_first()
+    records = game_replay.read_records(path)
+    assert len(records) == 40
+    for record in records:
+        assert [square for _, square in game_replay.replay_tictactoe(record)] == list(record.moves)
+
+def test_twenty_one_hands_replay(tmp_path):
+    path = tmp_path / 'games.bin'
+    script = random.Random(2)
+    with game_log.GameRecorder(path) as recorder:
+        game = TwentyOneGame(recorder=recorder, decks=2, rng=GameRandom(5))
+        ask = scripted(lambda prompt: script.choice(('hit', 'stay')))
+        for _ in range(60):
+            game.player.reset()
+            game.dealer.reset()
+            asyncio.run(game.play_one_game_async(ask))
+    records = game_replay.read_records(path)
+    assert len(records) == 60
+    for record in records:
+        player, dealer = game_replay.replay_twenty_one(record)
+        assert player.cards.codes() + dealer.cards.codes() == record.moves
+
+def test_rps_sessions_replay(tmp_path):
+    path = tmp_path / 'games.bin'
+    script = random.Random(3)
+
+    def answer(prompt):
+        if prompt == RPSGame._PLAY_AGAIN_PROMPT:
+            return next(answers)
+        return script.choice(('rock', 'paper', 'scissors'))
+
+    with game_log.GameRecorder(path) as recorder:
+        for _ in range(2):
+            answers = iter(['Y'] * 5 + [''])
+            asyncio.run(RPSGame(recorder, GameRandom(6), 'markov').play_async(scripted(answer)))
+    records = game_replay.read_records(path)
+    assert len({record.seed for record in records}) == 1
+    start, second = [index for index, record in enumerate(records)
+                     if record.first == game_log.SESSION_START]
+    assert start == 0
+    for index, record in enumerate(records):
+        session = game_replay.rps_session(records, index)
+        assert session == (records[:second] if index < second else records[second:])
+        assert tuple(record.moves) in game_replay.replay_rps(session)
+
+def test_replay_detects_a_changed_record(tmp_path):
+    path = tmp_path / 'games.bin'
+    with game_log.GameRecorder(path) as recorder:
+        game = TTTGame(recorder=recorder, rng=GameRandom(7))
+        game.player_going_first = 'computer'
+        ask = scripted(lambda prompt: str(game.board.available_squares()[0]))
+        asyncio.run(game.play_one_game_async(ask))
+    record = game_replay.read_records(path)[0]
+    with pytest.raises(ValueError):
+        game_replay.replay_tictactoe(record._replace(seed=record.seed + 1))
+
+def test_tournament_match_replays():
+    pytest.importorskip('numpy')
+    import rps_tournament
+
+    names = list(rps_tournament.STRATEGIES)
+    results = rps_tournament.tournament(names, games=20, rounds=50, seed=8, workers=1)
+    for name_a, name_b in [('random', 'markov'), ('cyclic', 'frequency'),
+                           ('markov', 'game-markov')]:
+        result, rounds = rps_tournament.replay_match(names, name_a, name_b, 20, 50, 3, 8, 4)
+        assert result == results[name_a, name_b]
+        assert len(rounds) == 50
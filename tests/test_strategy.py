@@ -0,0 +1,28 @@
+"""Policies see the true count of the cards they have not seen."""
+
+from game_random import GameRandom
+from twenty_one import PolicyPlayer, TwentyOneTable
+from twenty_one_strategy import CountingPlayer, CountingStrategy, strategy_table
+
+def test_policies_get_the_unseen_true_count():
+    seen = []
+
+    def policy(hand, upcard_code, true_count):
+        seen.append((true_count, table.dealer.unseen_true_count()))
+        return strategy_table().move(hand, upcard_code)
+
+    table = TwentyOneTable([PolicyPlayer(policy, 1000, 1, 10**6)], decks=2, rng=GameRandom(3))
+    table.play(200)
+    assert seen
+    assert all(given == expected for given, expected in seen)
+    assert any(given != 0 for given, _ in seen)
+
+def test_counting_strategy_deviates_only_past_its_count():
+    strategy = CountingStrategy(deviation_count=2)
+    table = TwentyOneTable([CountingPlayer(2, 1000, 1, 10**6)], rng=GameRandom(4))
+    for _ in range(300):
+        table.play_round()
+        hand, upcard = table.seats[0].cards, table.dealer.upcard
+        for true_count in (-1.5, 0, 1.9):
+            assert strategy(hand, upcard, true_count) == strategy_table().move(hand, upcard)
+        assert strategy(hand, upcard, 6.2) == strategy_table(6).move(hand, upcard)
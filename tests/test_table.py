@@ -0,0 +1,26 @@
+"""Table seats stop betting once their bankroll reaches its bounds."""
+
+from game_random import GameRandom
+from twenty_one import TwentyOneTable
+from twenty_one_strategy import BasicStrategyPlayer
+
+def test_seats_sit_out_at_their_bounds():
+    seats = [BasicStrategyPlayer(1, 1, 2), BasicStrategyPlayer(1000, 1, 10**6)]
+    table = TwentyOneTable(seats, rng=GameRandom(5))
+    for _ in range(50):
+        table.play_round()
+        assert seats[1] in table.seats_in_play()
+        if seats[0].rich_or_poor():
+            break
+    assert seats[0].betting_money in (0, 2)
+    cards = seats[0].cards.codes()
+    results = table.play_round()
+    assert results[0] is None and results[1] is not None
+    assert seats[0].betting_money in (0, 2) and seats[0].cards.codes() == cards
+
+def test_play_ends_once_every_seat_is_out():
+    seats = [BasicStrategyPlayer(1, 1, 2) for _ in range(3)]
+    tallies = TwentyOneTable(seats, rng=GameRandom(6)).play(100)
+    assert all(seat.rich_or_poor() for seat in seats)
+    assert all(sum(tally.values()) >= 1 for tally in tallies)
+    assert all(sum(tally.values()) < 100 for tally in tallies)
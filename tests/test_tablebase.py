@@ -0,0 +1,24 @@
+"""A freshly written tablebase passes its own verify()."""
+
+import pytest
+
+import ttt_tablebase
+
+def test_written_tablebase_verifies(tmp_path):
+    path = tmp_path / 'ttt_tablebase.bin'
+    entries = ttt_tablebase.write_tablebase(path)
+    assert entries > 0
+    assert ttt_tablebase.verify(path) == len(ttt_tablebase.reachable_positions())
+    assert [child.name for child in tmp_path.iterdir()] == ['ttt_tablebase.bin']
+
+def test_verify_rejects_a_corrupted_entry(tmp_path):
+    path = tmp_path / 'ttt_tablebase.bin'
+    ttt_tablebase.write_tablebase(path)
+    data = bytearray(path.read_bytes())
+    code, _ = ttt_tablebase.canonical(0, 0)
+    entry = data[ttt_tablebase.HEADER_SIZE + code]
+    assert entry >> 4 == 1
+    data[ttt_tablebase.HEADER_SIZE + code] = entry + 0x10  # a tie becomes a win
+    path.write_bytes(bytes(data))
+    with pytest.raises(ValueError):
+        ttt_tablebase.verify(path)
@@ -0,0 +1,97 @@
+"""
+NumPy batch engine for many Tic Tac Toe boards at once.
+
+BatchBoards keeps K boards as a (K, 9) int8 array holding EMPTY, HUMAN or
+COMPUTER per cell (cell = key - 1). Every query works on the whole batch:
+one gather through LINE_CELLS lays out the three cells of every winning
+row, win detection sums them, and the win-else-block rule of
+Computer.smart_choices is a handful of array operations on the same
+gather. Requires numpy.
+"""
+
+import numpy as np
+
+from oop_game import Square, WINNING_ROWS
+
+EMPTY = 0
+HUMAN = 1
+COMPUTER = -1
+CODES = {Square.INITIAL_MARKER: EMPTY,
+         Square.HUMAN_MARKER: HUMAN,
+         Square.COMPUTER_MARKER: COMPUTER}
+
+# LINE_CELLS[line] holds the three cells of WINNING_ROWS[line].
+LINE_CELLS = np.array(WINNING_ROWS, dtype=np.intp) - 1
+
+class BatchBoards:
+    """K boards stored as a (K, 9) int8 array."""
+    def __init__(self, count):
+        self.cells = np.zeros((count, 9), dtype=np.int8)
+
+    @classmethod
+    def from_boards(cls, boards):
+        """Build a batch from Board (or BitBoard) objects."""
+        batch = cls(len(boards))
+        batch.cells[:] = [[CODES[board.squares[key].marker] for key in range(1, 10)]
+                          for board in boards]
+        return batch
+
+    def __len__(self):
+        return len(self.cells)
+
+    def reset(self):
+        self.cells[:] = EMPTY
+
+    def mark(self, keys, code):
+        """Mark square keys[i] of board i with `code`; a key of 0 is skipped."""
+        keys = np.asarray(keys)
+        rows = np.flatnonzero(keys)
+        self.cells[rows, keys[rows] - 1] = code
+
+    def line_counts(self, code):
+        """Return a (K, 8) array counting `code` cells on each winning row."""
+        return (self.lines() == code).sum(axis=2, dtype=np.int8)
+
+    def lines(self):
+        """Return a (K, 8, 3) array of the cells on each winning row."""
+        return self.cells[:, LINE_CELLS]
+
+    def winners(self):
+        """Return a (K,) array with HUMAN, COMPUTER or EMPTY for no winner."""
+        sums = self.lines().sum(axis=2, dtype=np.int8)
+        return np.where((sums == 3).any(axis=1), HUMAN,
+                        np.where((sums == -3).any(axis=1), COMPUTER, EMPTY))
+
+    def legal_moves(self):
+        """Return a (K, 9) boolean mask of empty cells."""
+        return self.cells == EMPTY
+
+    def is_full(self):
+        return ~self.legal_moves().any(axis=1)
+
+    def is_game_over(self):
+        return (self.winners() != EMPTY) | self.is_full()
+
+    def winning_squares(self, code):
+        """
+        Return a (K,) array with the key that completes a row for `code` on
+        each board, or 0 where there is none. Rows are tried in
+        WINNING_ROWS order, like Computer.find_winning_square.
+        """
+        # Cells hold -1, 0 or 1, so a row sums to 2 * code only when it has
+        # two `code` cells and one empty cell.
+        lines = self.lines()
+        threats = lines.sum(axis=2, dtype=np.int8) == 2 * code
+        first_line = threats.argmax(axis=1)
+        rows = np.arange(len(self.cells))
+        empty_slot = (lines[rows, first_line] == EMPTY).argmax(axis=1)
+        keys = LINE_CELLS[first_line, empty_slot] + 1
+        return np.where(threats.any(axis=1), keys, 0)
+
+    def smart_choices(self, code, opponent_code):
+        """
+        Return the win-else-block key for `code` on every board, or 0 where
+        Computer.smart_choices would return None.
+        """
+        wins = self.winning_squares(code)
+        return np.where(wins != 0, wins, self.winning_squares(opponent_code))
@@ -0,0 +1,187 @@
+"""
+Headless Tic Tac Toe simulations between pluggable agents.
+
+Games are played on raw bitmasks with no terminal I/O and are sharded
+across a multiprocessing pool by simulation.run_sharded. Game number n of
+a run draws from its own GameRandom stream, seeded with
+GameRandom(seed).seed_for(n), so results do not depend on the shard or
+worker count, and any single game can be replayed on its own with
+--replay n.
+
+An agent is a picklable callable `agent(own, other, rng)` that returns the
+bit of the square it marks, where `own` and `other` are the 9-bit masks of
+the agent and its opponent.
+
+Run `python ttt_simulate.py smart perfect --games 1000000` for a match,
+and `python ttt_simulate.py smart perfect --replay 1234` to replay game 1234.
+"""
+
+import argparse
+import time
+from collections import Counter
+
+from game_random import GameRandom
+from oop_game import FULL_MASK, HAS_ROW, THREATS, negamax
+from simulation import numbered_streams, run_sharded
+
+# EMPTY_BITS[empty] lists the single-square bits set in the mask `empty`.
+EMPTY_BITS = tuple(tuple(1 << cell for cell in range(9) if empty >> cell & 1)
+                   for empty in range(FULL_MASK + 1))
+
+# COMPLETIONS[own] lists, in THREATS order, the bits that would complete a
+# row for `own` if they were empty.
+COMPLETIONS = tuple(tuple(missing_bit for mask, pair, missing_bit, _ in THREATS
+                          if own & mask == pair)
+                    for own in range(FULL_MASK + 1))
+
+_tablebase = None
+
+def random_agent(own, other, rng):
+    """Mark a random empty square."""
+    return rng.choice(EMPTY_BITS[~(own | other) & FULL_MASK])
+
+def smart_agent(own, other, rng):
+    """Win, else block, else mark a random square, like Computer.smart_choices."""
+    empty = ~(own | other) & FULL_MASK
+    for bit in COMPLETIONS[own]:
+        if empty & bit:
+            return bit
+    for bit in COMPLETIONS[other]:
+        if empty & bit:
+            return bit
+    return rng.choice(EMPTY_BITS[empty])
+
+def perfect_agent(own, other, rng):
+    """Mark a random square among those that are optimal under perfect play."""
+    best_value = None
+    best_bits = []
+    for bit in EMPTY_BITS[~(own | other) & FULL_MASK]:
+        mine = own | bit
+        value = 2 if HAS_ROW[mine] else -negamax(other, mine)
+        if best_value is None or value > best_value:
+            best_value = value
+            best_bits = [bit]
+        elif value == best_value:
+            best_bits.append(bit)
+    return rng.choice(best_bits)
+
+def load_tablebase():
+    """Open the tablebase tablebase_agent reads, generating the file if needed."""
+    global _tablebase
+    if _tablebase is None:
+        import ttt_tablebase
+        _tablebase = ttt_tablebase.open_tablebase()
+    return _tablebase
+
+def tablebase_agent(own, other, rng):
+    """Mark the tablebase's best square."""
+    if _tablebase is None:
+        load_tablebase()
+    return 1 << (_tablebase.best_move(own, other) - 1)
+
+AGENTS = {
+    'random': random_agent,
+    'smart': smart_agent,
+    'perfect': perfect_agent,
+    'tablebase': tablebase_agent,
+}
+
+def play_game(first, second, rng, moves=None):
+    """
+    Play one game and return 0 if `first` wins, 1 if `second` wins or None.
+    When `moves` is a list, the bit of every move is appended to it.
+    """
+    agents = (first, second)
+    own = other = 0
+    turn = 0
+    while True:
+        bit = agents[turn](own, other, rng)
+        own |= bit
+        if moves is not None:
+            moves.append(bit)
+        if HAS_ROW[own]:
+            return turn
+        if own | other == FULL_MASK:
+            return None
+        own, other = other, own
+        turn ^= 1
+
+def play_shard(agent_a, agent_b, start, games, seed):
+    """
+    Play games start to start + games - 1 of the run seeded with `seed`,
+    with agent_a moving first in even games, and return a Counter of
+    'a_wins', 'b_wins', 'ties', 'first_mover_wins' and 'second_mover_wins'.
+    """
+    results = Counter()
+    for game, rng in numbered_streams(start, games, seed):
+        a_first = game % 2 == 0
+        first, second = (agent_a, agent_b) if a_first else (agent_b, agent_a)
+        winner = play_game(first, second, rng)
+        if winner is None:
+            results['ties'] += 1
+            continue
+        results['first_mover_wins' if winner == 0 else 'second_mover_wins'] += 1
+        a_won = (winner == 0) == a_first
+        results['a_wins' if a_won else 'b_wins'] += 1
+    return results
+
+def replay_game(agent_a, agent_b, game, seed=0):
+    """
+    Replay game number `game` of the run seeded with `seed` and return
+    (first agent, winner as in play_game, list of square keys in order).
+    """
+    a_first = game % 2 == 0
+    first, second = (agent_a, agent_b) if a_first else (agent_b, agent_a)
+    moves = []
+    winner = play_game(first, second, GameRandom(GameRandom(seed).seed_for(game)), moves)
+    return first, winner, [bit.bit_length() for bit in moves]
+
+def simulate(agent_a, agent_b, games, seed=0, workers=None, shards=None):
+    """
+    Play `games` games between two agents across a process pool and return
+    the merged Counter of results. With workers=1 everything runs in this
+    process.
+    """
+    if tablebase_agent in (agent_a, agent_b):
+        # Build the file once here, not concurrently in every worker.
+        load_tablebase()
+    return run_sharded(play_shard, (agent_a, agent_b), games, seed, workers, shards)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('agent_a', choices=AGENTS)
+    parser.add_argument('agent_b', choices=AGENTS)
+    parser.add_argument('--games', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--replay', type=int, metavar='GAME',
+                        help='replay one game of the run and print its moves')
+    args = parser.parse_args()
+
+    if args.replay is not None:
+        first, winner, keys = replay_game(AGENTS[args.agent_a], AGENTS[args.agent_b],
+                                          args.replay, args.seed)
+        first_name = args.agent_a if first is AGENTS[args.agent_a] else args.agent_b
+        second_name = args.agent_b if first_name == args.agent_a else args.agent_a
+        print(f"game {args.replay}, seed {args.seed}: {first_name} moves first")
+        names = (first_name, second_name)
+        for turn, key in enumerate(keys):
+            print(f"  {names[turn % 2]} marks square {key}")
+        print('tie' if winner is None else f"{names[winner]} wins")
+        return
+
+    start = time.perf_counter()
+    results = simulate(AGENTS[args.agent_a], AGENTS[args.agent_b], args.games,
+                       args.seed, args.workers)
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.agent_a} wins: {results['a_wins']}")
+    print(f"{args.agent_b} wins: {results['b_wins']}")
+    print(f"ties: {results['ties']}")
+    print(f"first mover wins: {results['first_mover_wins']}, "
+          f"second mover wins: {results['second_mover_wins']}")
+    print(f"{args.games} games in {elapsed:.2f}s "
+          f"({args.games / elapsed * 60:,.0f} games/minute)")
+
+if __name__ == '__main__':
+    main()
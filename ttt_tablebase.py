@@ -0,0 +1,236 @@
+"""
+Precomputed Tic Tac Toe tablebase.
+
+The generator enumerates every position reachable under TTTGame's rules
+(either side may move first), folds the 8 rotations and reflections of the
+board into one canonical key and writes the game value and best move of
+each canonical position to a small binary file. Tablebase memory-maps that
+file and answers each lookup with 8 table reads and one byte read.
+
+File layout:
+    MAGIC (4 bytes), VERSION (1 byte), then 3 ** 9 entry bytes indexed by
+    the canonical base-3 code of the position (0 empty, 1 mover, 2 opponent).
+    Each entry is (value + 1) << 4 | cell, where value is -1, 0 or 1 for the
+    side to move and cell is the best move (0 to 8) in the canonical frame,
+    or NO_MOVE for finished games. Unreachable codes hold MISSING.
+
+Run `python ttt_tablebase.py [path]` to generate and verify the file.
+"""
+
+import mmap
+import os
+import sys
+
+from oop_game import FULL_MASK, HAS_ROW, WINNING_ROWS, negamax, square_bit
+
+MAGIC = b'TTTB'
+VERSION = 1
+HEADER_SIZE = len(MAGIC) + 1
+ENTRY_COUNT = 3 ** 9
+NO_MOVE = 0xF
+MISSING = 0xFF
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            'ttt_tablebase.bin')
+
+def _symmetries():
+    """Return the 8 board symmetries as tuples mapping cell -> new cell."""
+    identity = tuple(range(9))
+    rotate = tuple(3 * col + (2 - row) for row in range(3) for col in range(3))
+    reflect = tuple(3 * row + (2 - col) for row in range(3) for col in range(3))
+
+    def compose(first, second):
+        return tuple(second[first[cell]] for cell in range(9))
+
+    symmetries = []
+    current = identity
+    for _ in range(4):
+        symmetries.append(current)
+        symmetries.append(compose(current, reflect))
+        current = compose(current, rotate)
+    return tuple(symmetries)
+
+SYMMETRIES = _symmetries()
+INVERSES = tuple(tuple(perm.index(cell) for cell in range(9)) for perm in SYMMETRIES)
+
+# CODE_TABLES[s][bits] is the base-3 weight of the cells in `bits` after
+# applying symmetry s, so a position's code under s is two table reads.
+CODE_TABLES = tuple(
+    tuple(sum(3 ** perm[cell] for cell in range(9) if bits >> cell & 1)
+          for bits in range(FULL_MASK + 1))
+    for perm in SYMMETRIES
+)
+
+def canonical(own, other):
+    """
+    Return (code, symmetry) for the smallest base-3 code among the 8
+    symmetric images of the position, where `own` is the side to move.
+    """
+    best_code = ENTRY_COUNT
+    best_symmetry = 0
+    for symmetry, table in enumerate(CODE_TABLES):
+        code = table[own] + 2 * table[other]
+        if code < best_code:
+            best_code = code
+            best_symmetry = symmetry
+    return best_code, best_symmetry
+
+def is_finished(own, other):
+    return HAS_ROW[own] or HAS_ROW[other] or (own | other) == FULL_MASK
+
+def reachable_positions():
+    """
+    Return every (mover bits, opponent bits) position reachable from an
+    empty board when either marker may move first.
+    """
+    seen = {(0, 0)}
+    frontier = [(0, 0)]
+    while frontier:
+        own, other = frontier.pop()
+        if is_finished(own, other):
+            continue
+        empty = ~(own | other) & FULL_MASK
+        while empty:
+            bit = empty & -empty
+            empty ^= bit
+            child = (other, own | bit)
+            if child not in seen:
+                seen.add(child)
+                frontier.append(child)
+    return seen
+
+def solve(own, other):
+    """Return (value, cell) for the side to move; cell is None when finished."""
+    if HAS_ROW[other]:
+        return -1, None
+    if (own | other) == FULL_MASK:
+        return 0, None
+
+    best_value = None
+    best_cell = None
+    for cell in range(9):
+        bit = 1 << cell
+        if (own | other) & bit:
+            continue
+        mine = own | bit
+        value = 1 if HAS_ROW[mine] else -negamax(other, mine)
+        if best_value is None or value > best_value:
+            best_value = value
+            best_cell = cell
+        if value == 1:
+            break
+    return best_value, best_cell
+
+def build_table():
+    """Return the tablebase entries as a bytearray of ENTRY_COUNT bytes."""
+    table = bytearray([MISSING]) * ENTRY_COUNT
+    for own, other in reachable_positions():
+        code, symmetry = canonical(own, other)
+        if table[code] != MISSING:
+            continue
+        perm = SYMMETRIES[symmetry]
+        value, cell = solve(own, other)
+        cell = NO_MOVE if cell is None else perm[cell]
+        table[code] = (value + 1) << 4 | cell
+    return table
+
+def write_tablebase(path=DEFAULT_PATH):
+    """
+    Generate the tablebase, write it to `path` and return the entry count.
+    The file is written under a temporary name and renamed into place, so
+    a reader never maps a partly written file.
+    """
+    table = build_table()
+    temporary = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temporary, 'wb') as file:
+            file.write(MAGIC + bytes([VERSION]) + table)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+    return sum(1 for entry in table if entry != MISSING)
+
+class Tablebase:
+    """Memory-mapped reader for a file written by write_tablebase."""
+    def __init__(self, path=DEFAULT_PATH):
+        with open(path, 'rb') as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if (len(self._map) != HEADER_SIZE + ENTRY_COUNT
+                or self._map[:len(MAGIC)] != MAGIC
+                or self._map[len(MAGIC)] != VERSION):
+            self._map.close()
+            raise ValueError(f"{path} is not a version {VERSION} tablebase")
+
+    def close(self):
+        self._map.close()
+
+    def lookup(self, own, other):
+        """
+        Return (value, key) for the side to move, where `key` is the best
+        square (1 to 9) or None when the game is already over.
+        """
+        code, symmetry = canonical(own, other)
+        entry = self._map[HEADER_SIZE + code]
+        if entry == MISSING:
+            raise KeyError((own, other))
+        cell = entry & 0xF
+        key = None if cell == NO_MOVE else INVERSES[symmetry][cell] + 1
+        return (entry >> 4) - 1, key
+
+    def best_move(self, own, other):
+        """Return the best square (1 to 9) for the side to move."""
+        return self.lookup(own, other)[1]
+
+def open_tablebase(path=DEFAULT_PATH):
+    """Return a Tablebase for `path`, generating the file first if needed."""
+    if not os.path.exists(path):
+        write_tablebase(path)
+    return Tablebase(path)
+
+def row_filled(bits):
+    """Check `bits` against WINNING_ROWS directly, without the masks."""
+    return any(all(bits & square_bit(key) for key in row) for row in WINNING_ROWS)
+
+def verify(path=DEFAULT_PATH):
+    """
+    Check every reachable position of the file at `path` against
+    WINNING_ROWS and against its children. Raise ValueError on the first
+    inconsistency and return the number of positions checked.
+    """
+    tablebase = Tablebase(path)
+    try:
+        positions = reachable_positions()
+        for own, other in positions:
+            value, key = tablebase.lookup(own, other)
+            finished = (row_filled(own) or row_filled(other)
+                        or (own | other) == FULL_MASK)
+            if finished != (key is None):
+                raise ValueError(f"Finished flag is wrong for {(own, other)}")
+            if finished:
+                expected = -1 if row_filled(other) else 0
+                if value != expected:
+                    raise ValueError(f"Wrong value for finished {(own, other)}")
+                continue
+
+            child_values = {}
+            for cell in range(9):
+                bit = 1 << cell
+                if (own | other) & bit:
+                    continue
+                mine = own | bit
+                child_values[cell + 1] = (1 if row_filled(mine)
+                                          else -tablebase.lookup(other, mine)[0])
+            if value != max(child_values.values()):
+                raise ValueError(f"Value disagrees with children at {(own, other)}")
+            if child_values.get(key) != value:
+                raise ValueError(f"Best move {key} is not optimal at {(own, other)}")
+        return len(positions)
+    finally:
+        tablebase.close()
+
+if __name__ == '__main__':
+    target = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH
+    entries = write_tablebase(target)
+    checked = verify(target)
+    print(f"Wrote {entries} canonical positions to {target} "
+          f"({os.path.getsize(target)} bytes); verified {checked} positions.")
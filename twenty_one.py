@@ -1,67 +1,87 @@
-import random
-import os
 
-def clear_screen():
-    os.system('clear')
+import cards
+from instrument import INSTRUMENTS
+from renderer import Renderer
+
+SUITS = ("Spades", "Hearts", "Diamonds", "Clubs")
+VALUES = (2, 3, 4, 5, 6, 7, 8, 9, 10, "Jack", "Queen", "King", "Ace")
 
 class Deck:
-    def __init__(self):
-        self.suits = ["Spades", "Hearts", "Diamonds", "Clubs"]
-        self.values = [2, 3, 4, 5, 6, 7, 8, 9, 10, "Jack", "Queen", "King", "Ace"]
-        self.cards = [(suit, value) for suit in self.suits for value in self.values]
+    """
+    Lookup tables for the 52 cards: Deck.CARDS maps each card code (see
+    cards.py) to its (suit, value) tuple and Deck.INDEXES maps it back.
+    Cards are dealt from Dealer.shoe.
+    """
+    CARDS = tuple((SUITS[cards.suit_of(code)], VALUES[cards.rank_of(code)])
+                  for code in range(cards.DECK_SIZE))
+    INDEXES = {card: code for code, card in enumerate(CARDS)}
+
+class Hand(cards.Hand):
+    """
+    cards.Hand that reads like a list of (suit, value) tuples, with the
+    running total of the cards it holds.
+    """
+    __slots__ = ()
+
+    def __init__(self, tuples=()):
+        super().__init__(Deck.INDEXES[card] for card in tuples)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [Deck.CARDS[code] for code in self._codes[position]]
+        return Deck.CARDS[self._codes[position]]
+
+    def __iter__(self):
+        return (Deck.CARDS[code] for code in self._codes)
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def append(self, card):
+        self.add(Deck.INDEXES[card])
 
 class Participants:
-    def __init__(self):
+    """
+    Someone holding a hand. With `verbose` False nothing is printed while
+    the hand is played, so automated seats run headless.
+    """
+    __slots__ = ('score', 'cards', 'verbose')
+
+    def __init__(self, verbose=True):
         self.score = 0
-        self.cards = []
-        self.total_values = 0
+        self.cards = Hand()
+        self.verbose = verbose
+
+    @property
+    def total_values(self):
+        return self.cards.total
 
     def hit(self, dealer):
         dealer.deals_a_card(self)
-        print(f"Drawn card is {self.cards[-1]}.")
+        if self.verbose:
+            print(f"Drawn card is {self.cards[-1]}.")
 
     def display_initial_values(self):
-
-        for suit, value in self.cards:
-            if value in ["Jack", "Queen", "King", "Ace"]:
-                value = 10
-                self.total_values += value
-            elif value == 'Ace' and self.total_values + value > 21:
-                value = 1
-                self.total_values += value
-            elif value == 'Ace' and self.total_values + value <= 21:
-                value = 11
-                self.total_values += value
-            else:
-                self.total_values += value
-        print(f'You have {self.cards}.')
-        print(f'Your current total value is {self.total_values}')
+        if self.verbose:
+            print(f'You have {self.cards}.')
+            print(f'Your current total value is {self.total_values}')
 
     def calculate_additional_value(self):
-        suit, added_value = self.cards[-1]
-        if added_value in ["Jack", "Queen", "King"]:
-            added_value = 10
-            self.total_values += added_value
-        elif added_value == 'Ace' and self.total_values + added_value > 21:
-            added_value = 1
-            self.total_values += added_value
-        elif added_value == 'Ace' and self.total_values + added_value <= 21:
-            added_value = 11
-            self.total_values += added_value
-        else:
-            self.total_values += added_value
-
+        """Return the total including the last card drawn. The hand keeps
+        its total up to date, so Aces are re-valued as cards arrive."""
         return self.total_values
 
     def stay(self):
         pass
 
     def busted(self):
-        return self.total_values > 21
+        return self.cards.busted()
 
     def reset(self):
-        self.cards = []
-        self.total_values = 0
+        self.cards = Hand()
 
     # def reveal_values(self):
 
@@ -70,70 +90,189 @@ class Participants:
 
 
 class Dealer(Participants):
-    def __init__(self):
+    __slots__ = ('shoe', 'upcard', 'hand_start')
+
+    # The dealer keeps drawing while the hand total is at or below this.
+    HITS_UP_TO = 17
+
+    def __init__(self, decks=1, penetration=0.75, rng=None):
         super().__init__()
-        self.deck = Deck()
+        self.shoe = cards.Shoe(decks, penetration, rng)
+        self.upcard = None
+        self.hand_start = 0
 
     def shuffle_cards(self):
-        random.shuffle(self.deck.cards)
-
-    def initial_deals(self, player):
-        player.cards = [self.deck.cards.pop(), self.deck.cards.pop()]
-        self.cards = [self.deck.cards.pop(), self.deck.cards.pop()]
+        """Reshuffle the shoe once the cut card has come out."""
+        self.shoe.shuffle_if_needed()
+
+    def initial_deals(self, *players):
+        """Deal two cards to each player in seat order, then two to the dealer."""
+        self.hand_start = self.shoe.dealt
+        for player in players:
+            player.cards = Hand()
+            player.cards.add(self.shoe.deal())
+            player.cards.add(self.shoe.deal())
+        self.cards = Hand()
+        self.cards.add(self.shoe.deal())
+        self.cards.add(self.shoe.deal())
 
     def deals_a_card(self, participant):
-        participant.cards.append(self.deck.cards.pop())
+        participant.cards.add(self.shoe.deal())
 
     def plays(self, dealer):
-        while self.total_values <= 17:
+        with INSTRUMENTS.phase('dealer_turn'):
+            self._draw_to_stand(dealer)
+
+    def _draw_to_stand(self, dealer):
+        while self.total_values <= Dealer.HITS_UP_TO:
             self.hit(dealer)
             self.calculate_additional_value()
             if self.busted():
-                print('Dealer busted!')
+                if self.verbose:
+                    print('Dealer busted!')
                 break
 
+    def hand_origin(self):
+        """Return (decks, hand_start, shoe seed): what replays the hand."""
+        return self.shoe.decks, self.hand_start, self.shoe.stream.initial_seed
+
+    def unseen_true_count(self):
+        """
+        Hi-Lo true count of the cards a player has not seen: the undealt
+        shoe plus every dealer card but the upcard.
+        """
+        running_count = self.shoe.running_count
+        unseen = len(self.shoe)
+        for code in self.cards.codes():
+            running_count -= cards.HI_LO[cards.CARD_VALUES[code]]
+            unseen += 1
+        if self.upcard is not None:
+            running_count += cards.HI_LO[cards.CARD_VALUES[self.upcard]]
+            unseen -= 1
+        return running_count * cards.DECK_SIZE / max(unseen, 1)
+
     def reveal_card(self):
-        random_card = random.choice(self.cards)
-        print(f'Dealer has {random_card}.')
+        """
+        Show one of the dealer's cards at random and remember its code. The
+        choice comes from the shoe stream's child for this hand, so the hand
+        replays from the shoe's seed and `hand_start`.
+        """
+        self.upcard = self.shoe.stream.split(self.hand_start).choice(self.cards.codes())
+        if self.verbose:
+            print(f'Dealer has {Deck.CARDS[self.upcard]}.')
 
 class Player(Participants):
-    def __init__(self):
-        super().__init__()
-        self.betting_money = 5
+    """
+    A player with a bankroll (`betting_money`) who stakes `bet` on every
+    hand. The session is over once the bankroll reaches `goal` or can no
+    longer cover a bet.
+    """
+    __slots__ = ('betting_money', 'starting_money', 'bet', 'goal')
+
+    MOVE_PROMPT = "Choose `hit` or `stay`: "
+    PAYOUTS = {'player': 1, 'dealer': -1, 'tie': 0}
+
+    def __init__(self, betting_money=5, bet=1, goal=10, verbose=True):
+        super().__init__(verbose)
+        if bet < 1:
+            raise ValueError("bet must be at least 1")
+        if not bet <= betting_money < goal:
+            raise ValueError("betting_money must cover a bet and be below goal")
+        self.starting_money = betting_money
+        self.betting_money = betting_money
+        self.bet = bet
+        self.goal = goal
 
     def rich_or_poor(self):
-        rich = 10
-        poor = 0
-        return self.betting_money in [rich, poor]
+        return self.betting_money >= self.goal or self.betting_money < self.bet
 
-    def reset(self):
-        super().reset()
-        self.betting_money = 5
+    def reset_bankroll(self):
+        self.betting_money = self.starting_money
+
+    def settle(self, result):
+        """Pay or collect the bet for a determine_winner result; return the change."""
+        change = Player.PAYOUTS[result] * self.bet
+        self.betting_money += change
+        return change
+
+    def choose_move(self, dealer):
+        """
+        Return the next move, 'hit' or 'stay'. A Player asks at the
+        terminal; automated players override this to decide without input.
+        """
+        return input(Player.MOVE_PROMPT)
 
     def plays(self, dealer):
-        while True:
-            if self.busted():
-                print('Oops! You busted!')
-                break
-            else:
-                move = input("Choose `hit` or `stay`: ")
-                if move == 'hit':
-                    self.hit(dealer)
-                    print(f'Your current total value is {self.calculate_additional_value()}')
-                elif move == 'stay':
-                    print(f'Your final total value is {self.total_values}')
-                    break
-                else:
-                    print('Invalid Input. Type either hit or stay.')
+        while not self.busted():
+            if self.take_move(self.choose_move(dealer), dealer) == 'stay':
+                return
+        if self.verbose:
+            print('Oops! You busted!')
+
+    async def plays_async(self, dealer, ask):
+        while not self.busted():
+            if self.take_move(await ask(Player.MOVE_PROMPT), dealer) == 'stay':
+                return
+        print('Oops! You busted!')
+
+    def take_move(self, move, dealer):
+        """Carry out `move` and return it, or return None if it is invalid."""
+        if move == 'hit':
+            self.hit(dealer)
+            if self.verbose:
+                print(f'Your current total value is {self.calculate_additional_value()}')
+        elif move == 'stay':
+            if self.verbose:
+                print(f'Your final total value is {self.total_values}')
+        else:
+            print('Invalid Input. Type either hit or stay.')
+            return None
+
+        return move
+
+class PolicyPlayer(Player):
+    """
+    Automated player whose moves come from `policy(hand, upcard_code,
+    true_count)`, which returns 'hit' or 'stay' and must not block.
+    `true_count` is Dealer.unseen_true_count, the Hi-Lo count of every card
+    the player has not seen. It plays silently.
+    """
+    __slots__ = ('policy',)
+
+    def __init__(self, policy, betting_money=5, bet=1, goal=10):
+        super().__init__(betting_money, bet, goal, verbose=False)
+        self.policy = policy
+
+    def choose_move(self, dealer):
+        return self.policy(self.cards, dealer.upcard, dealer.unseen_true_count())
+
+def determine_winner(player, dealer):
+    """Return 'player', 'dealer' or 'tie' for a finished player hand."""
+    if player.busted():
+        return 'dealer'
+    if dealer.busted():
+        return 'player'
+    if player.total_values > dealer.total_values:
+        return 'player'
+    if player.total_values < dealer.total_values:
+        return 'dealer'
+    return 'tie'
 
 class TwentyOneGame:
-    def __init__(self):
-        self.player = Player()
-        self.dealer = Dealer()
+    __slots__ = ('player', 'dealer', 'renderer', 'recorder')
+
+    ANOTHER_GAME_PROMPT = "Do you want to play another game? (y/n): "
+
+    def __init__(self, recorder=None, decks=1, penetration=0.75,
+                 betting_money=5, bet=1, goal=10, rng=None):
+        self.player = Player(betting_money, bet, goal)
+        self.dealer = Dealer(decks, penetration, rng)
+        self.renderer = Renderer()
+        self.recorder = recorder
 
     def start(self):
         self.display_welcome_message()
-        self.player.reset()
+        self.player.reset_bankroll()
 
         while True:
             self.player.reset()
@@ -141,35 +280,84 @@ class TwentyOneGame:
             self.play_one_game()
             if self.ask_another_game() == 'n' or self.player.rich_or_poor():
                 break
-            clear_screen()
+            self.renderer.clear()
 
         self.display_goodbye_message()
 
-    def play_one_game(self):
+    async def start_async(self, ask):
+        """Same as start, but reads every answer with the awaitable `ask`."""
+        self.display_welcome_message()
+        self.player.reset_bankroll()
+
         while True:
-            self.dealer.shuffle_cards()
-            self.dealer.initial_deals(self.player)
-            self.dealer.reveal_card()
-            self.player.display_initial_values()
-            self.player.plays(self.dealer)
-            if self.player.busted():
+            self.player.reset()
+            self.dealer.reset()
+            await self.play_one_game_async(ask)
+            if await self.ask_another_game_async(ask) == 'n' or self.player.rich_or_poor():
                 break
+            self.renderer.clear()
+
+        self.display_goodbye_message()
+
+    def play_one_game(self):
+        with INSTRUMENTS.phase('deal'):
+            self.deal_opening_hands()
+        with INSTRUMENTS.phase('input_wait'):
+            self.player.plays(self.dealer)
+        with INSTRUMENTS.phase('scoring'):
+            self.finish_one_game()
+        INSTRUMENTS.count('twenty_one_games')
+
+    async def play_one_game_async(self, ask):
+        with INSTRUMENTS.phase('deal'):
+            self.deal_opening_hands()
+        with INSTRUMENTS.phase('input_wait'):
+            await self.player.plays_async(self.dealer, ask)
+        with INSTRUMENTS.phase('scoring'):
+            self.finish_one_game()
+        INSTRUMENTS.count('twenty_one_games')
+
+    def deal_opening_hands(self):
+        self.dealer.shuffle_cards()
+        self.dealer.initial_deals(self.player)
+        self.dealer.reveal_card()
+        self.player.display_initial_values()
+
+    def finish_one_game(self):
+        if not self.player.busted():
             self.dealer.plays(self.dealer)
-            if self.dealer.busted():
-                break
-            self.display_result()
-            self.update_betting_money()
+            if not self.dealer.busted():
+                self.display_result()
+        self.update_betting_money()
+
+        if self.recorder is not None:
+            self.recorder.record_twenty_one(self.player.cards.codes(),
+                                            self.dealer.cards.codes(),
+                                            self.determine_winner(),
+                                            *self.dealer.hand_origin())
 
-            break
+    def determine_winner(self):
+        """Return 'player', 'dealer' or 'tie' for the finished game."""
+        return determine_winner(self.player, self.dealer)
 
     def update_betting_money(self):
-        #self.player.betting_money += 1 or -= 1 depends on the result
-        pass
+        self.player.settle(self.determine_winner())
+        print(f'Your betting money is now ${self.player.betting_money}.')
 
     def ask_another_game(self):
 
         while True:
-            response = input("Do you want to play another game? (y/n): ").lower()
+            response = input(TwentyOneGame.ANOTHER_GAME_PROMPT).lower()
+
+            if response in ["y", "n"]:
+                return response
+
+            print("Invalid Input. Please enter either y or n.")
+
+    async def ask_another_game_async(self, ask):
+
+        while True:
+            response = (await ask(TwentyOneGame.ANOTHER_GAME_PROMPT)).lower()
 
             if response in ["y", "n"]:
                 return response
@@ -185,25 +373,104 @@ class TwentyOneGame:
         "will be compared - whoever is closer to 21 wins! \n"
         "You can Hit as many times as you'd like during your turn, but if your "
         "total exceeds 21, you bust and lose the round. \n"
-        "You'll start with $5 in betting money. \n"
-        "Each win earns you $1, and each loss costs you $1. \n"
-        "each time you win. \nThat means, you will lose $1 each time you lose :(. \n"
-        "The game ends when you either lose all your money or strike it rich "
-        "with $10. \nOf course, you can quit anytime you want. \n"
+        f"You'll start with ${self.player.betting_money} in betting money. \n"
+        f"Each win earns you ${self.player.bet}, and each loss costs you "
+        f"${self.player.bet} :(. \n"
+        "The game ends when you either can't cover a bet any more or strike it "
+        f"rich with ${self.player.goal}. \nOf course, you can quit anytime you want. \n"
         "Good luck and have fun! :) ")
 
     def display_result(self):
-        print(f'Final value is Player: {self.player.total_values} : Dealer: '
-        f'{self.dealer.total_values}')
+        lines = [f'Final value is Player: {self.player.total_values} : Dealer: '
+        f'{self.dealer.total_values}']
         if self.player.total_values > self.dealer.total_values:
-            print("Congratulations! You won!")
+            lines.append("Congratulations! You won!")
         elif self.player.total_values < self.dealer.total_values:
-            print("Sorry! Dealer won!")
+            lines.append("Sorry! Dealer won!")
         else:
-            print("It's a tie!")
+            lines.append("It's a tie!")
+        self.renderer.show(lines)
 
     def display_goodbye_message(self):
+        if self.player.betting_money >= self.player.goal:
+            print(f"You reached ${self.player.goal}!")
+        elif self.player.betting_money < self.player.bet:
+            print("You don't have enough money left to bet.")
         print("Thanks for playing Twenty-One Game! Goodbye!")
 
-game = TwentyOneGame()
-game.start()
+class TwentyOneTable:
+    """
+    Up to MAX_SEATS players drawing from one shoe. Every round each seat
+    plays its hand in turn, then the dealer plays once against all of them.
+    Seats are Player objects; automated seats (PolicyPlayer,
+    twenty_one_strategy.BasicStrategyPlayer, ...) never wait for input and
+    never print. The dealer prints only when some seat is verbose, so a
+    table of automated seats runs headless.
+
+    As in TwentyOneGame, a seat whose bankroll has reached its goal or can
+    no longer cover its bet (Player.rich_or_poor) sits out every later
+    round, and play ends the session once every seat is out.
+    """
+    __slots__ = ('seats', 'dealer', 'recorder')
+
+    MAX_SEATS = 7
+
+    def __init__(self, seats, recorder=None, decks=1, penetration=0.75, rng=None):
+        if not 1 <= len(seats) <= TwentyOneTable.MAX_SEATS:
+            raise ValueError(f"A table seats 1 to {TwentyOneTable.MAX_SEATS} players")
+        self.seats = list(seats)
+        self.dealer = Dealer(decks, penetration, rng)
+        self.dealer.verbose = any(seat.verbose for seat in self.seats)
+        self.recorder = recorder
+
+    def seats_in_play(self):
+        """Return the seats whose bankroll is still within its bounds."""
+        return [seat for seat in self.seats if not seat.rich_or_poor()]
+
+    def play_round(self):
+        """
+        Play one round and return each seat's determine_winner result, or
+        None for a seat sitting out.
+        """
+        seats = self.seats_in_play()
+        if not seats:
+            return [None] * len(self.seats)
+        with INSTRUMENTS.phase('deal'):
+            self.dealer.shuffle_cards()
+            self.dealer.initial_deals(*seats)
+            self.dealer.reveal_card()
+        with INSTRUMENTS.phase('input_wait'):
+            for seat in seats:
+                seat.display_initial_values()
+                seat.plays(self.dealer)
+        with INSTRUMENTS.phase('scoring'):
+            if not all(seat.busted() for seat in seats):
+                self.dealer.plays(self.dealer)
+            results = {seat: determine_winner(seat, self.dealer) for seat in seats}
+            for seat, result in results.items():
+                seat.settle(result)
+            if self.recorder is not None:
+                for seat, result in results.items():
+                    self.recorder.record_twenty_one(seat.cards.codes(),
+                                                    self.dealer.cards.codes(), result,
+                                                    *self.dealer.hand_origin())
+        INSTRUMENTS.count('twenty_one_games', len(seats))
+        return [results.get(seat) for seat in self.seats]
+
+    def play(self, rounds):
+        """
+        Play up to `rounds` rounds, stopping once every seat is out, and
+        return a {result: count} dict per seat.
+        """
+        tallies = [{'player': 0, 'dealer': 0, 'tie': 0} for _ in self.seats]
+        for _ in range(rounds):
+            if not self.seats_in_play():
+                break
+            for tally, result in zip(tallies, self.play_round()):
+                if result is not None:
+                    tally[result] += 1
+        return tallies
+
+if __name__ == '__main__':
+    game = TwentyOneGame()
+    game.start()
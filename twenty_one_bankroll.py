@@ -0,0 +1,121 @@
+"""
+Vectorized bankroll and risk-of-ruin simulator for TwentyOneGame sessions.
+
+A session starts with `betting_money`, stakes `bet` on every hand and ends,
+as Player.rich_or_poor decides, once the bankroll reaches `goal` or can no
+longer cover a bet. Each hand is won, pushed or lost with fixed
+probabilities, by default measured with twenty_one_batch under basic
+strategy. Trajectories run as NumPy random walks: a block of hands is drawn
+for every live session at once, its cumulative sum gives the bankroll path,
+and the first bound crossing in the block ends the session.
+
+Run `python twenty_one_bankroll.py --sessions 1000000 --bet 1 --goal 10`.
+Requires numpy.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+BLOCK = 256
+CHUNK = 100000
+
+def measured_probabilities(hands=1000000, decks=1, seed=0):
+    """Return (win, push, loss) probabilities of basic strategy from a batch run."""
+    from twenty_one_batch import play_batch, strategy_array
+    counts = play_batch(hands, strategy_array(), decks,
+                        np.random.default_rng(seed)).outcome_counts()
+    return counts['player'] / hands, counts['tie'] / hands, counts['dealer'] / hands
+
+def simulate_chunk(sessions, betting_money, bet, goal, probabilities, max_hands, rng):
+    """
+    Return (rich, poor, hands) arrays for `sessions` sessions: whether each
+    reached `goal`, whether it ran out of money and how many hands it took.
+    Sessions still going after `max_hands` hands are neither rich nor poor.
+    """
+    money = np.full(sessions, betting_money, dtype=np.int64)
+    hands = np.zeros(sessions, dtype=np.int64)
+    rich = np.zeros(sessions, dtype=bool)
+    poor = np.zeros(sessions, dtype=bool)
+    live = np.arange(sessions)
+    win, push, _ = probabilities
+
+    while len(live) and hands[live[0]] < max_hands:
+        block = min(BLOCK, max_hands - hands[live[0]])
+        draws = rng.random((len(live), block), dtype=np.float32)
+        outcomes = (draws < win).astype(np.int8) - (draws >= win + push)
+        paths = money[live, None] + bet * np.cumsum(outcomes, axis=1, dtype=np.int64)
+        crossed = (paths >= goal) | (paths < bet)
+        ended = crossed.any(axis=1)
+        first = crossed.argmax(axis=1)
+
+        done = live[ended]
+        final = paths[ended, first[ended]]
+        hands[done] += first[ended] + 1
+        money[done] = final
+        rich[done] = final >= goal
+        poor[done] = final < bet
+
+        going = live[~ended]
+        hands[going] += block
+        money[going] = paths[~ended, -1]
+        live = going
+    return rich, poor, hands
+
+def simulate(sessions, betting_money=5, bet=1, goal=10, probabilities=None,
+             max_hands=100000, seed=0):
+    """
+    Run `sessions` bankroll trajectories in chunks and return a dict with
+    risk of ruin, chance of reaching the goal, unfinished sessions and the
+    mean and 99th percentile session length in hands.
+    """
+    if not bet <= betting_money < goal:
+        raise ValueError("betting_money must cover a bet and be below goal")
+    probabilities = probabilities or measured_probabilities()
+    rng = np.random.default_rng(seed)
+    rich = poor = 0
+    lengths = []
+    for start in range(0, sessions, CHUNK):
+        chunk_rich, chunk_poor, chunk_hands = simulate_chunk(
+            min(CHUNK, sessions - start), betting_money, bet, goal,
+            probabilities, max_hands, rng)
+        rich += int(chunk_rich.sum())
+        poor += int(chunk_poor.sum())
+        lengths.append(chunk_hands)
+    lengths = np.concatenate(lengths)
+    return {'sessions': sessions,
+            'risk_of_ruin': poor / sessions,
+            'reached_goal': rich / sessions,
+            'unfinished': (sessions - rich - poor) / sessions,
+            'mean_hands': float(lengths.mean()),
+            'p99_hands': float(np.percentile(lengths, 99))}
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulate Twenty-One bankrolls.')
+    parser.add_argument('--sessions', type=int, default=1000000)
+    parser.add_argument('--money', type=int, default=5, help='starting betting money')
+    parser.add_argument('--bet', type=int, default=1)
+    parser.add_argument('--goal', type=int, default=10)
+    parser.add_argument('--max-hands', type=int, default=100000)
+    parser.add_argument('--win', type=float,
+                        help='per-hand win probability (default: measured)')
+    parser.add_argument('--push', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    probabilities = None
+    if args.win is not None:
+        probabilities = (args.win, args.push, 1 - args.win - args.push)
+
+    start = time.perf_counter()
+    report = simulate(args.sessions, args.money, args.bet, args.goal,
+                      probabilities, args.max_hands, args.seed)
+    elapsed = time.perf_counter() - start
+    for name, value in report.items():
+        print(f"{name:<14}{value:>12,.4f}" if isinstance(value, float)
+              else f"{name:<14}{value:>12,}")
+    print(f"{args.sessions / elapsed:,.0f} sessions/s")
+
+if __name__ == '__main__':
+    main()
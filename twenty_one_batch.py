@@ -0,0 +1,133 @@
+"""
+NumPy batch engine for many Twenty-One hands at once.
+
+BatchHands deals K hands from K pre-shuffled shoes held in a (K, N) int8
+array of card codes, one shoe per hand. Both hands are kept as hard totals
+plus an "holds an Ace" flag, so soft totals are one np.where, and every
+round of drawing is a masked gather across the batch. The player draws by
+a stand-on limit or a basic-strategy lookup table; the dealer follows
+Dealer's rule (draw while the total is at most Dealer.HITS_UP_TO).
+Requires numpy.
+"""
+
+import numpy as np
+
+import cards
+from twenty_one import Dealer
+
+DEALER_WON = -1
+TIE = 0
+PLAYER_WON = 1
+RESULT_NAMES = {DEALER_WON: 'dealer', TIE: 'tie', PLAYER_WON: 'player'}
+
+CARD_VALUES = np.array(cards.CARD_VALUES, dtype=np.int16)
+IS_ACE = np.array(cards.IS_ACE, dtype=bool)
+
+def best_totals(hard_totals, has_ace):
+    """Vectorized cards.best_total."""
+    return np.where(has_ace & (hard_totals + 10 <= 21), hard_totals + 10, hard_totals)
+
+def shuffled_shoes(count, decks=1, rng=None):
+    """Return a (count, 52 * decks) int8 array, each row a shuffled shoe."""
+    rng = rng if rng is not None else np.random.default_rng()
+    shoe = np.tile(np.arange(cards.DECK_SIZE, dtype=np.int8), decks)
+    return rng.permuted(np.tile(shoe, (count, 1)), axis=1)
+
+def strategy_array():
+    """
+    Return a (32, 2, 11) bool array: hits[hard total, has Ace, upcard value]
+    from twenty_one_strategy.should_hit, False wherever the hand is bust.
+    """
+    from twenty_one_strategy import MAX_HARD, should_hit
+    hits = np.zeros((MAX_HARD + 1, 2, 11), dtype=bool)
+    for hard_total in range(2, 22):
+        for has_ace in (False, True):
+            for upcard in range(1, 11):
+                hits[hard_total, int(has_ace), upcard] = should_hit(hard_total, has_ace, upcard)
+    return hits
+
+class BatchHands:
+    """K hands, each dealt from its own shoe row: player, player, dealer, dealer."""
+    def __init__(self, shoes):
+        self.shoes = shoes
+        self.rows = np.arange(len(shoes))
+        self.position = np.full(len(shoes), 4, dtype=np.intp)
+        self.player_hard = CARD_VALUES[shoes[:, 0]] + CARD_VALUES[shoes[:, 1]]
+        self.player_ace = IS_ACE[shoes[:, 0]] | IS_ACE[shoes[:, 1]]
+        self.dealer_hard = CARD_VALUES[shoes[:, 2]] + CARD_VALUES[shoes[:, 3]]
+        self.dealer_ace = IS_ACE[shoes[:, 2]] | IS_ACE[shoes[:, 3]]
+        self.upcards = shoes[:, 2]
+
+    @classmethod
+    def deal(cls, count, decks=1, rng=None):
+        return cls(shuffled_shoes(count, decks, rng))
+
+    def __len__(self):
+        return len(self.shoes)
+
+    def player_totals(self):
+        return best_totals(self.player_hard, self.player_ace)
+
+    def dealer_totals(self):
+        return best_totals(self.dealer_hard, self.dealer_ace)
+
+    def player_busted(self):
+        return self.player_hard > 21
+
+    def dealer_busted(self):
+        return self.dealer_hard > 21
+
+    def _draw(self, hard_totals, has_ace, drawing):
+        """Give one card to every hand where `drawing` is True."""
+        rows = self.rows[drawing]
+        codes = self.shoes[rows, self.position[rows]]
+        hard_totals[rows] += CARD_VALUES[codes]
+        has_ace[rows] |= IS_ACE[codes]
+        self.position[rows] += 1
+
+    def play_player(self, policy=17):
+        """
+        Draw player cards until every hand stands or busts. `policy` is
+        either a stand-on total or a hits array from strategy_array().
+        """
+        upcard_values = CARD_VALUES[self.upcards]
+        while True:
+            if isinstance(policy, np.ndarray):
+                drawing = policy[np.minimum(self.player_hard, len(policy) - 1),
+                                 self.player_ace.astype(np.intp), upcard_values]
+            else:
+                drawing = self.player_totals() < policy
+            drawing &= ~self.player_busted()
+            if not drawing.any():
+                return
+            self._draw(self.player_hard, self.player_ace, drawing)
+
+    def play_dealer(self):
+        """Draw dealer cards, as Dealer.plays does, wherever the player stood."""
+        standing = ~self.player_busted()
+        while True:
+            drawing = standing & (self.dealer_totals() <= Dealer.HITS_UP_TO)
+            if not drawing.any():
+                return
+            self._draw(self.dealer_hard, self.dealer_ace, drawing)
+
+    def results(self):
+        """
+        Return a (K,) int8 array of PLAYER_WON, DEALER_WON or TIE, the batch
+        form of TwentyOneGame.determine_winner.
+        """
+        compared = np.sign(self.player_totals() - self.dealer_totals())
+        compared = np.where(self.dealer_busted(), PLAYER_WON, compared)
+        return np.where(self.player_busted(), DEALER_WON, compared).astype(np.int8)
+
+    def outcome_counts(self):
+        """Return {'player': wins, 'dealer': losses, 'tie': pushes}."""
+        counts = np.bincount(self.results() + 1, minlength=3)
+        return {RESULT_NAMES[result]: int(counts[result + 1]) for result in RESULT_NAMES}
+
+def play_batch(count, policy=17, decks=1, rng=None):
+    """Deal and play `count` hands and return the finished BatchHands."""
+    hands = BatchHands.deal(count, decks, rng)
+    hands.play_player(policy)
+    hands.play_dealer()
+    return hands
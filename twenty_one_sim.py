@@ -0,0 +1,134 @@
+"""
+Parallel Monte Carlo simulator for solution.py's Twenty-One rules.
+
+Hands are dealt with initialize_deck and scored with total, busted and
+detect_result, under a configurable player policy. The dealer hits below
+17 as in solution.main. Hands are split into shards that run on a
+multiprocessing pool, and the merged outcome counts are reported with 95%
+Wilson confidence intervals. Hand number n of a run is dealt from its own
+GameRandom stream (see simulation.py), so results do not depend on the
+shard count and any hand can be replayed with --replay n.
+
+Run `python twenty_one_sim.py --hands 1000000 --policy stand:17`.
+"""
+
+import argparse
+import math
+import time
+from collections import Counter
+
+from cards import Hand
+from game_random import GameRandom
+from simulation import numbered_streams, run_sharded
+from solution import busted, detect_result, hand, initialize_deck, total
+
+OUTCOMES = ('PLAYER', 'DEALER_BUSTED', 'TIE', 'DEALER', 'PLAYER_BUSTED')
+DEALER_STANDS_ON = 17
+
+class StandOn:
+    """Player policy: hit while the hand total is below `limit`."""
+    def __init__(self, limit):
+        self.limit = limit
+
+    def __call__(self, player_cards, dealer_upcard):
+        return total(player_cards) < self.limit
+
+    def __repr__(self):
+        return f"stand:{self.limit}"
+
+def parse_policy(text):
+    """Build a policy from 'stand:N' or 'dealer' (hit below 17)."""
+    if text == 'dealer':
+        return StandOn(DEALER_STANDS_ON)
+    name, _, limit = text.partition(':')
+    if name == 'stand' and limit.isdigit():
+        return StandOn(int(limit))
+    raise argparse.ArgumentTypeError(f"Unknown policy: {text!r}")
+
+def deal_hand(policy, rng):
+    """Deal and play one hand and return (player cards, dealer cards)."""
+    deck = initialize_deck(rng)
+    player_cards = Hand([deck.pop(), deck.pop()])
+    dealer_cards = Hand([deck.pop(), deck.pop()])
+
+    while policy(player_cards, dealer_cards[0]):
+        player_cards.add(deck.pop())
+        if busted(player_cards):
+            break
+
+    if not busted(player_cards):
+        while total(dealer_cards) < DEALER_STANDS_ON:
+            dealer_cards.add(deck.pop())
+
+    return player_cards, dealer_cards
+
+def play_hand(policy, rng):
+    """Deal and play one hand and return detect_result's outcome."""
+    player_cards, dealer_cards = deal_hand(policy, rng)
+    return detect_result(dealer_cards, player_cards)
+
+def play_shard(policy, start, hands, seed):
+    """Play hands start to start + hands - 1 of the run seeded with `seed`."""
+    results = Counter()
+    for _, rng in numbered_streams(start, hands, seed):
+        results[play_hand(policy, rng)] += 1
+    return results
+
+def replay_hand(policy, number, seed=0):
+    """Replay hand `number` of the run seeded with `seed`; return deal_hand's cards."""
+    return deal_hand(policy, GameRandom(GameRandom(seed).seed_for(number)))
+
+def simulate(policy, hands, seed=0, workers=None, shards=None):
+    """
+    Play `hands` hands across a process pool and return a Counter of
+    detect_result outcomes. With workers=1 everything runs in this process.
+    """
+    return run_sharded(play_shard, (policy,), hands, seed, workers, shards)
+
+def wilson_interval(successes, trials, z=1.96):
+    """Return the (low, high) Wilson score interval for a proportion."""
+    if trials == 0:
+        return 0.0, 0.0
+    rate = successes / trials
+    denominator = 1 + z * z / trials
+    centre = (rate + z * z / (2 * trials)) / denominator
+    margin = z * math.sqrt(rate * (1 - rate) / trials
+                           + z * z / (4 * trials * trials)) / denominator
+    return centre - margin, centre + margin
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--hands', type=int, default=100000)
+    parser.add_argument('--policy', type=parse_policy, default=StandOn(17),
+                        help="'stand:N' or 'dealer' (default stand:17)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--replay', type=int, metavar='HAND',
+                        help='replay one hand of the run and print its cards')
+    args = parser.parse_args()
+
+    if args.replay is not None:
+        player_cards, dealer_cards = replay_hand(args.policy, args.replay, args.seed)
+        print(f"hand {args.replay}, seed {args.seed}, policy {args.policy!r}")
+        print(f"player: {hand(player_cards)} ({total(player_cards)})")
+        print(f"dealer: {hand(dealer_cards)} ({total(dealer_cards)})")
+        print(detect_result(dealer_cards, player_cards))
+        return
+
+    start = time.perf_counter()
+    results = simulate(args.policy, args.hands, args.seed, args.workers)
+    elapsed = time.perf_counter() - start
+
+    print(f"policy {args.policy!r}, {args.hands} hands")
+    for outcome in OUTCOMES:
+        low, high = wilson_interval(results[outcome], args.hands)
+        print(f"{outcome:<15}{results[outcome] / args.hands:>9.4f}"
+              f"   95% CI [{low:.4f}, {high:.4f}]")
+    player_wins = results['PLAYER'] + results['DEALER_BUSTED']
+    low, high = wilson_interval(player_wins, args.hands)
+    print(f"{'player wins':<15}{player_wins / args.hands:>9.4f}"
+          f"   95% CI [{low:.4f}, {high:.4f}]")
+    print(f"{args.hands / elapsed:,.0f} hands/s over {elapsed:.2f}s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,224 @@
+"""
+Exact basic strategy for twenty_one.py's rules, and a Player that uses it.
+
+The rules are the ones TwentyOneGame plays: a busted player loses, the
+dealer draws while the total is at most Dealer.HITS_UP_TO, a busted dealer
+loses, otherwise the higher total wins and equal totals tie. The player
+sees one dealer card (the upcard) and the other is unknown.
+
+Expected values are computed exactly by memoized dynamic programming over
+the card probabilities of an infinite shoe (each rank 1/13, ten-valued
+ranks 4/13), with no sampling. StrategyTable flattens the hit/stay
+decision for every player hard total, soft/hard state and dealer upcard
+into a bytearray so each decision is one index operation.
+
+Card counters get one StrategyTable per Hi-Lo true count, solved over an
+infinite shoe whose card probabilities are shifted to that count (see
+true_count_probabilities), so a deviation costs the same single lookup.
+Those tables are the count-keyed cache of dealer results: solving the
+dealer tree for the exact composition of the unseen cards takes
+milliseconds, and every dealt card changes the composition.
+
+Run `python twenty_one_strategy.py` to print the strategy chart.
+"""
+
+from functools import lru_cache
+
+import cards
+from twenty_one import Dealer, Player, PolicyPlayer
+
+# Probability of drawing each hard card value (Ace = 1) from an infinite shoe.
+CARD_PROBABILITIES = {value: (4 if value == 10 else 1) / 13 for value in range(1, 11)}
+# The same probabilities as hashable (value, probability) pairs. Every
+# solver function below takes such pairs as `probabilities`.
+INFINITE_SHOE = tuple(CARD_PROBABILITIES.items())
+BUST = 22
+MAX_HARD = 31
+# True counts beyond this use the table of this count.
+MAX_TRUE_COUNT = 10
+
+def true_count_probabilities(true_count):
+    """
+    Return (value, probability) pairs for an infinite shoe at a Hi-Lo true
+    count of `true_count`. Per 52 cards, true_count / 2 low cards (2 to 6)
+    are swapped for true_count / 2 high cards (tens and Aces), each group
+    changing in proportion to its ranks, which is the average shoe behind
+    that count.
+    """
+    shift = true_count / 2
+    pairs = []
+    for value in range(1, 11):
+        count = 13 * 4 * CARD_PROBABILITIES[value]
+        tag = cards.HI_LO[value]
+        # 20 low and 20 high cards per deck.
+        pairs.append((value, (count - tag * shift * count / 20) / cards.DECK_SIZE))
+    return tuple(pairs)
+
+@lru_cache(maxsize=None)
+def dealer_outcomes(hard_total, has_ace, probabilities=INFINITE_SHOE):
+    """
+    Return {final total or BUST: probability} for a dealer hand with the
+    given hard total (Aces as 1) who keeps drawing per Dealer.HITS_UP_TO.
+    """
+    total = cards.best_total(hard_total, has_ace)
+    if hard_total > 21:
+        return {BUST: 1.0}
+    if total > Dealer.HITS_UP_TO:
+        return {total: 1.0}
+
+    outcomes = {}
+    for value, probability in probabilities:
+        drawn = dealer_outcomes(hard_total + value, has_ace or value == 1, probabilities)
+        for final, final_probability in drawn.items():
+            outcomes[final] = outcomes.get(final, 0.0) + probability * final_probability
+    return outcomes
+
+@lru_cache(maxsize=None)
+def dealer_outcomes_from_upcard(upcard_value, probabilities=INFINITE_SHOE):
+    """Dealer final-total distribution when only the upcard is known."""
+    return dealer_outcomes(upcard_value, upcard_value == 1, probabilities)
+
+@lru_cache(maxsize=None)
+def stand_value(player_total, upcard_value, probabilities=INFINITE_SHOE):
+    """Expected result (+1 win, 0 tie, -1 loss) of standing on `player_total`."""
+    value = 0.0
+    for final, probability in dealer_outcomes_from_upcard(upcard_value,
+                                                          probabilities).items():
+        if final == BUST or final < player_total:
+            value += probability
+        elif final > player_total:
+            value -= probability
+    return value
+
+@lru_cache(maxsize=None)
+def hit_value(hard_total, has_ace, upcard_value, probabilities=INFINITE_SHOE):
+    """Expected result of taking one card and then playing optimally."""
+    value = 0.0
+    for card, probability in probabilities:
+        new_hard = hard_total + card
+        if new_hard > 21:
+            value -= probability
+        else:
+            value += probability * best_value(new_hard, has_ace or card == 1, upcard_value,
+                                              probabilities)
+    return value
+
+@lru_cache(maxsize=None)
+def best_value(hard_total, has_ace, upcard_value, probabilities=INFINITE_SHOE):
+    total = cards.best_total(hard_total, has_ace)
+    return max(stand_value(total, upcard_value, probabilities),
+               hit_value(hard_total, has_ace, upcard_value, probabilities))
+
+def should_hit(hard_total, has_ace, upcard_value, probabilities=INFINITE_SHOE):
+    total = cards.best_total(hard_total, has_ace)
+    return (hit_value(hard_total, has_ace, upcard_value, probabilities)
+            > stand_value(total, upcard_value, probabilities))
+
+def upcard_value(code):
+    """Return the hard value (Ace = 1) of a dealer upcard code."""
+    return cards.CARD_VALUES[code]
+
+class StrategyTable:
+    """
+    Hit/stay decisions for every (hard total, soft, upcard) in a bytearray,
+    solved over the card `probabilities` (value, probability) pairs.
+    """
+    def __init__(self, probabilities=INFINITE_SHOE):
+        self._hits = bytearray(MAX_HARD * 2 * 11)
+        for hard_total in range(2, 22):
+            for has_ace in (False, True):
+                for upcard in range(1, 11):
+                    self._hits[self._index(hard_total, has_ace, upcard)] = \
+                        should_hit(hard_total, has_ace, upcard, probabilities)
+
+    @staticmethod
+    def _index(hard_total, has_ace, upcard):
+        return (hard_total * 2 + has_ace) * 11 + upcard
+
+    def should_hit(self, hand, upcard_code):
+        """Return True if `hand` (a cards.Hand) should hit against the upcard."""
+        if hand.hard_total > 21:
+            return False
+        return bool(self._hits[self._index(hand.hard_total, hand.aces > 0,
+                                           cards.CARD_VALUES[upcard_code])])
+
+    def move(self, hand, upcard_code):
+        return 'hit' if self.should_hit(hand, upcard_code) else 'stay'
+
+_tables = {}
+
+def strategy_table(true_count=0):
+    """
+    Return the process-wide StrategyTable for an integer Hi-Lo
+    `true_count`, building it on first use. A count of 0 is basic strategy.
+    """
+    table = _tables.get(true_count)
+    if table is None:
+        if not -MAX_TRUE_COUNT <= true_count <= MAX_TRUE_COUNT:
+            raise ValueError(f"true_count must be within {MAX_TRUE_COUNT} of 0")
+        table = _tables[true_count] = StrategyTable(
+            true_count_probabilities(true_count) if true_count else INFINITE_SHOE)
+    return table
+
+class BasicStrategyPlayer(Player):
+    """Player that looks every decision up in the strategy table instead of asking."""
+    __slots__ = ()
+
+    def __init__(self, betting_money=5, bet=1, goal=10):
+        super().__init__(betting_money, bet, goal, verbose=False)
+
+    def choose_move(self, dealer):
+        return strategy_table().move(self.cards, dealer.upcard)
+
+class CountingStrategy:
+    """
+    PolicyPlayer policy that follows basic strategy while the true count
+    is within `deviation_count` of zero, and the strategy table of the
+    rounded true count otherwise. Every decision is one lookup; the tables
+    are built once per process.
+    """
+    __slots__ = ('deviation_count',)
+
+    def __init__(self, deviation_count=2):
+        self.deviation_count = deviation_count
+
+    def __call__(self, hand, upcard_code, true_count):
+        if abs(true_count) < self.deviation_count:
+            return strategy_table().move(hand, upcard_code)
+        true_count = max(-MAX_TRUE_COUNT, min(MAX_TRUE_COUNT, round(true_count)))
+        return strategy_table(true_count).move(hand, upcard_code)
+
+class CountingPlayer(PolicyPlayer):
+    """PolicyPlayer playing CountingStrategy(deviation_count)."""
+    __slots__ = ()
+
+    def __init__(self, deviation_count=2, betting_money=5, bet=1, goal=10):
+        super().__init__(CountingStrategy(deviation_count), betting_money, bet, goal)
+
+def chart():
+    """Return the strategy chart as text: H = hit, S = stay."""
+    upcards = list(range(2, 11)) + [1]
+    header = 'total ' + ' '.join(f"{'A' if up == 1 else up:>2}" for up in upcards)
+    lines = ['Hard totals', header]
+    for total in range(4, 21):
+        lines.append(f"{total:>5} " + ' '.join(
+            f"{'H' if should_hit(total, False, up) else 'S':>2}" for up in upcards))
+    lines += ['', 'Soft totals', header]
+    for total in range(13, 21):
+        lines.append(f"A+{total - 11:<3} " + ' '.join(
+            f"{'H' if should_hit(total - 10, True, up) else 'S':>2}" for up in upcards))
+    return '\n'.join(lines)
+
+def opening_value():
+    """Expected result of a whole hand under basic strategy."""
+    value = 0.0
+    for up, up_probability in CARD_PROBABILITIES.items():
+        for first, first_probability in CARD_PROBABILITIES.items():
+            for second, second_probability in CARD_PROBABILITIES.items():
+                value += (up_probability * first_probability * second_probability
+                          * best_value(first + second, first == 1 or second == 1, up))
+    return value
+
+if __name__ == '__main__':
+    print(chart())
+    print(f"\nExpected result per hand under basic strategy: {opening_value():+.4f}")